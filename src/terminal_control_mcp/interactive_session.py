@@ -10,7 +10,7 @@ from pathlib import Path
 import libtmux
 
 from .interaction_logger import InteractionLogger
-from .settings import ServerConfig
+from .settings import ServerConfig, get_config
 
 logger = logging.getLogger(__name__)
 
@@ -23,6 +23,18 @@ def _strip_ansi_sequences(text: str) -> str:
     return ANSI_ESCAPE_PATTERN.sub("", text)
 
 
+def _send_keys(pane: libtmux.Pane, text: str, enter: bool, literal: bool) -> None:
+    """Send text to a tmux pane, raising if tmux rejects the command"""
+    # "--" ends option parsing, so text starting with "-" is not taken as flags
+    args = ("-l", "--", text) if literal else ("--", text)
+    result = pane.cmd("send-keys", *args)
+    if result.stderr:
+        # libtmux does not raise on tmux errors; the keys were not sent
+        raise RuntimeError("; ".join(result.stderr))
+    if enter:
+        pane.enter()
+
+
 class InteractiveSession:
     """Represents a single interactive terminal session using libtmux"""
 
@@ -58,7 +70,7 @@ class InteractiveSession:
 
     def _initialize_history_isolation(self) -> None:
         """Initialize history isolation if enabled"""
-        config = ServerConfig()
+        config = get_config()
         if config.isolate_history:
             temp_dir = Path(tempfile.gettempdir())
             self.history_dir: Path | None = temp_dir / f"mcp_history_{self.session_id}"
@@ -81,6 +93,8 @@ class InteractiveSession:
 
         # Track last input timestamp for "since_input" mode
         self.last_input_timestamp: float = 0
+        # Set after each input so output watchers (the web UI) look promptly
+        self.input_event = asyncio.Event()
 
     async def initialize(self) -> None:
         """Initialize the tmux session using libtmux"""
@@ -113,7 +127,7 @@ class InteractiveSession:
         )
 
         # Apply history isolation if enabled
-        config = ServerConfig()
+        config = get_config()
         if config.isolate_history and self.history_dir:
             self._configure_history_isolation(env)
 
@@ -125,7 +139,7 @@ class InteractiveSession:
         if not self.history_dir:
             return
 
-        config = ServerConfig()
+        config = get_config()
         self._create_shell_history_files(config)
         self._configure_shell_environments(env, config)
         self._configure_application_histories(env, config)
@@ -224,7 +238,7 @@ except (ImportError, FileNotFoundError):
 
     async def _create_tmux_session(self, env: dict[str, str]) -> None:
         """Create the tmux server and session"""
-        loop = asyncio.get_event_loop()
+        loop = asyncio.get_running_loop()
         self.tmux_server = await loop.run_in_executor(None, libtmux.Server)
         assert self.tmux_server is not None
 
@@ -232,7 +246,7 @@ except (ImportError, FileNotFoundError):
             raise RuntimeError("tmux server is not available")
 
         tmux_server = self.tmux_server
-        config = ServerConfig()
+        config = get_config()
         self.tmux_session = await loop.run_in_executor(
             None,
             lambda: tmux_server.new_session(
@@ -257,9 +271,9 @@ except (ImportError, FileNotFoundError):
         if self.tmux_session is None:
             raise RuntimeError("tmux session is not available")
 
-        loop = asyncio.get_event_loop()
+        loop = asyncio.get_running_loop()
         tmux_session = self.tmux_session
-        config = ServerConfig()
+        config = get_config()
         await loop.run_in_executor(
             None,
             lambda: tmux_session.cmd(
@@ -279,7 +293,7 @@ except (ImportError, FileNotFoundError):
         if self.tmux_pane is None:
             raise RuntimeError("tmux pane is not available")
 
-        loop = asyncio.get_event_loop()
+        loop = asyncio.get_running_loop()
         tmux_pane = self.tmux_pane
         output_file = str(self.output_stream_file)
 
@@ -309,7 +323,7 @@ except (ImportError, FileNotFoundError):
 
     async def _configure_session_environment(self, env: dict[str, str]) -> None:
         """Configure environment variables in the tmux session"""
-        loop = asyncio.get_event_loop()
+        loop = asyncio.get_running_loop()
 
         # Set all environment variables that are not from the base system env
         base_env_keys = set(os.environ.keys())
@@ -332,7 +346,7 @@ except (ImportError, FileNotFoundError):
             if self.tmux_pane is None:
                 raise RuntimeError("tmux pane is not available")
 
-            loop = asyncio.get_event_loop()
+            loop = asyncio.get_running_loop()
             tmux_pane = self.tmux_pane
             command = self.command
             await loop.run_in_executor(
@@ -351,7 +365,9 @@ except (ImportError, FileNotFoundError):
             },
         )
 
-    async def send_input(self, input_text: str, add_newline: bool = False) -> None:
+    async def send_input(
+        self, input_text: str, add_newline: bool = False, literal: bool = False
+    ) -> None:
         """Send input to the tmux session using libtmux"""
         if not self.is_active or not self.tmux_pane:
             raise RuntimeError("Session is not active")
@@ -364,14 +380,15 @@ except (ImportError, FileNotFoundError):
             self.interaction_logger.log_input_sent(input_text, "tmux_input")
 
             # Send input to tmux pane
-            loop = asyncio.get_event_loop()
+            loop = asyncio.get_running_loop()
             if self.tmux_pane is None:
                 raise RuntimeError("tmux pane is not available")
 
-            tmux_pane = self.tmux_pane  # Local variable for lambda
+            tmux_pane = self.tmux_pane  # Narrowed for the executor call
             await loop.run_in_executor(
-                None, lambda: tmux_pane.send_keys(input_text, enter=add_newline)
+                None, _send_keys, tmux_pane, input_text, add_newline, literal
             )
+            self.input_event.set()
 
         except Exception as e:
             self.interaction_logger.log_error("input_send_error", str(e))
@@ -383,7 +400,7 @@ except (ImportError, FileNotFoundError):
             return ""
 
         try:
-            loop = asyncio.get_event_loop()
+            loop = asyncio.get_running_loop()
             tmux_pane = self.tmux_pane
 
             # Use libtmux's capture_pane() method instead of cmd()
@@ -409,8 +426,8 @@ except (ImportError, FileNotFoundError):
 
         try:
             # Capture pane content with ANSI sequences using libtmux
-            loop = asyncio.get_event_loop()
-            tmux_pane = self.tmux_pane  # Local variable for lambda
+            loop = asyncio.get_running_loop()
+            tmux_pane = self.tmux_pane  # Narrowed for the executor call
             content = await loop.run_in_executor(
                 None,
                 lambda: tmux_pane.cmd("capture-pane", "-e", "-S", "-", "-E", "-", "-p"),
@@ -470,7 +487,7 @@ except (ImportError, FileNotFoundError):
             return ""
 
         try:
-            loop = asyncio.get_event_loop()
+            loop = asyncio.get_running_loop()
             tmux_pane = self.tmux_pane
             content = await loop.run_in_executor(
                 None,
@@ -524,7 +541,7 @@ except (ImportError, FileNotFoundError):
     async def _kill_tmux_session(self) -> None:
         """Kill the tmux session"""
         if self.tmux_session:
-            loop = asyncio.get_event_loop()
+            loop = asyncio.get_running_loop()
             tmux_session = self.tmux_session
             await loop.run_in_executor(None, lambda: tmux_session.kill())
 
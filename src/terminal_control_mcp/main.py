@@ -13,6 +13,7 @@ Core tools:
 """
 
 import asyncio
+import functools
 import logging
 import os
 import shutil
@@ -41,12 +42,12 @@ from .models import (
 )
 from .security import SecurityManager
 from .session_manager import SessionManager
-from .settings import ServerConfig
+from .settings import get_config
 from .terminal_utils import open_terminal_window
-from .web_server import WebServer
+from .web_server import WebServer, get_local_ip
 
 # Load configuration from TOML file and environment variables
-config = ServerConfig()
+config = get_config()
 
 # Always import WebServer for type annotations, handle runtime availability separately
 WEB_INTERFACE_AVAILABLE = True
@@ -133,7 +134,9 @@ async def app_lifespan(server: FastMCP) -> AsyncIterator[AppContext]:
     check_tmux_available()
 
     # Initialize components
-    session_manager = SessionManager(max_sessions=config.max_sessions)
+    session_manager = SessionManager(
+        max_sessions=config.max_sessions, web_enabled=config.web_enabled
+    )
     security_manager = SecurityManager(
         security_level=config.security_level,
         max_calls_per_minute=config.max_calls_per_minute,
@@ -151,6 +154,7 @@ async def app_lifespan(server: FastMCP) -> AsyncIterator[AppContext]:
         logger.info("Shutting down Terminal Control MCP Server...")
         await _cleanup_web_server(web_task)
         await _cleanup_sessions(session_manager)
+        security_manager.close()
 
 
 def _get_display_web_host() -> str:
@@ -160,14 +164,7 @@ def _get_display_web_host() -> str:
 
     # If binding to 0.0.0.0, provide a more user-friendly URL
     if web_host == "0.0.0.0":
-        import socket
-
-        try:
-            with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
-                s.connect(("8.8.8.8", 80))
-                web_host = s.getsockname()[0]
-        except Exception:
-            web_host = "localhost"
+        web_host = get_local_ip()
 
     return web_host
 
@@ -176,10 +173,17 @@ def _get_effective_web_port() -> int:
     """Get the effective web port, using auto-selection if enabled"""
     if not config.web_auto_port:
         return config.web_port
+    return _auto_web_port()
 
-    # Generate unique identifier based on current working directory and process ID
+
+@functools.cache
+def _auto_web_port() -> int:
+    """Pick this process's web port, once per process"""
+    # Cached: the server binds this port once at startup, so every URL must
+    # keep using it even if the working directory changes later
     import hashlib
 
+    # Generate unique identifier based on current working directory and process ID
     unique_id = f"{os.getcwd()}:{os.getpid()}"
     hash_value = int(hashlib.md5(unique_id.encode()).hexdigest()[:4], 16)
 
@@ -635,9 +639,24 @@ def main() -> None:
         print()
         sys.exit(0)
 
+    _install_uvloop()
     mcp.run()
 
 
+def _install_uvloop() -> None:
+    """Run the event loop on uvloop when the optional dependency is installed"""
+    try:
+        import uvloop
+    except ImportError:
+        logger.debug("uvloop not installed, using the default asyncio event loop")
+        return
+
+    # mcp.run() creates its loop through the policy, so this also covers the
+    # web server, which is served from that same loop
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    logger.info("Using uvloop event loop")
+
+
 def main_sync() -> None:
     """Synchronous entry point for console scripts"""
     main()
@@ -3,10 +3,18 @@ import logging
 import os
 import re
 import time
-from dataclasses import dataclass, field
+from collections.abc import Iterable
+from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import TYPE_CHECKING
+from types import ModuleType
+from typing import TYPE_CHECKING, TextIO
+
+fcntl: ModuleType | None
+try:
+    import fcntl
+except ImportError:  # Not available on Windows; audit writes go unlocked there
+    fcntl = None
 
 if TYPE_CHECKING:
     from .settings import SecurityLevel
@@ -22,36 +30,177 @@ DEL_CHAR_CODE = 127
 C1_CONTROL_START = 128
 C1_CONTROL_END = 159
 PROBLEMATIC_HIGH_BYTES = {254, 255}
+
+# str.translate() deletion table for characters rejected by input validation:
+# C0 controls (except tab, LF, CR), DEL, C1 controls and problematic high bytes
+DISALLOWED_CHARS_TABLE: dict[int, None] = dict.fromkeys(
+    [c for c in range(CONTROL_CHAR_THRESHOLD) if chr(c) not in "\t\n\r"]
+    + [DEL_CHAR_CODE]
+    + list(range(C1_CONTROL_START, C1_CONTROL_END + 1))
+    + sorted(PROBLEMATIC_HIGH_BYTES)
+)
+# Same characters as a regex class: search() stops at the first hit and
+# allocates nothing, which beats translate() on short strings
+DISALLOWED_CHARS_RE = re.compile(
+    "[" + "".join(re.escape(chr(c)) for c in DISALLOWED_CHARS_TABLE) + "]"
+)
+# Measured crossover below which the regex scan is faster than translate()
+SHORT_INPUT_LENGTH = 100
+
 MAX_LOG_VALUE_LENGTH = 200
+MAX_LOG_NON_STRING_LENGTH = 100
+SECRET_KEY_WORDS = ("password", "token", "key", "secret")
 
 # Default security limits
 DEFAULT_MAX_CALLS_PER_MINUTE = 60
+RATE_LIMIT_WINDOW_SECONDS = 60.0
 DEFAULT_MAX_SESSIONS = 50
 EXPECTED_MIN_BASE_PATHS = 4
 MAX_INPUT_TEXT_LENGTH = 10000  # Maximum allowed input text length
 
+# Dangerous command patterns that should be blocked
+BLOCKED_COMMAND_PATTERNS = (
+    r"\brm\s+-rf\s+/",  # rm -rf /
+    r"\bsudo\s+rm\s+-rf",  # sudo rm -rf
+    r"\bdd\s+if=/dev/zero",  # dd disk wipe
+    r"\bmkfs\.",  # filesystem formatting
+    r"\bfdisk\s",  # disk partitioning
+    r"\b:\(\)\{.*fork.*\}",  # fork bomb
+    r"\bchmod\s+777\s+/",  # dangerous permissions
+    r"\bchown\s+.*:.*\s+/",  # ownership changes on root
+    r"\biptables\s+-F",  # firewall flush
+    r"\bufw\s+--force\s+disable",  # firewall disable
+    r"\bsudo\s+passwd",  # password changes
+    r"\bsu\s+-",  # switch user
+    r"\bcrontab\s+-r",  # cron deletion
+    r"\bsystemctl\s+(stop|disable)\s+(ssh|network)",  # critical service shutdown
+)
+
+# Potential shell injection patterns in arbitrary string arguments
+INJECTION_PATTERNS = (
+    r";\s*rm\s",
+    r";\s*cat\s",
+    r";\s*curl\s",
+    r";\s*wget\s",
+    r"\$\([^)]*\)",
+    r"`[^`]*`",
+    r"\${[^}]*}",
+    r"\\x[0-9a-fA-F]{2}",  # hex escape sequences
+)
+
+# Additional patterns blocked in interactive input text
+DANGEROUS_INPUT_PATTERNS = (
+    r"sudo\s+.*",  # sudo commands
+    r"su\s+-",  # switch user
+    r"passwd\s*$",  # password command
+)
+
+# Most dangerous commands, blocked even at MEDIUM security level
+MEDIUM_DANGEROUS_PATTERNS = (
+    r"\brm\s+-rf\s+/",  # rm -rf /
+    r"\bdd\s+if=/dev/zero",  # dd disk wipe
+    r"\bmkfs\.",  # filesystem formatting
+    r"\b:\(\)\{.*fork.*\}",  # fork bomb
+)
+
+# Command injection attempts in the shell parameter
+DANGEROUS_SHELL_PATTERNS = (
+    r"[;&|`$()]",  # Shell metacharacters
+    r"\.\.\/",  # Path traversal
+    r"rm\s",  # Dangerous commands
+    r"sudo\s",
+    r"su\s",
+)
+
+# Disk-destroying tools rejected when they are the command's first word
+DANGEROUS_FIRST_WORDS = frozenset(("format", "fdisk", "parted", "mkfs", "wipefs"))
+
+
+def _compile_alternation(patterns: tuple[str, ...], flags: int = 0) -> re.Pattern[str]:
+    """Combine a family of patterns into one compiled alternation"""
+    return re.compile("|".join(f"(?:{p})" for p in patterns), flags)
+
+
+# One regex per family means validation scans the input only once; compiled at
+# import so every SecurityManager shares them
+BLOCKED_COMMAND_RE = _compile_alternation(BLOCKED_COMMAND_PATTERNS, re.IGNORECASE)
+INJECTION_RE = _compile_alternation(INJECTION_PATTERNS, re.IGNORECASE)
+DANGEROUS_INPUT_RE = _compile_alternation(DANGEROUS_INPUT_PATTERNS, re.IGNORECASE)
+MEDIUM_DANGEROUS_RE = _compile_alternation(MEDIUM_DANGEROUS_PATTERNS, re.IGNORECASE)
+DANGEROUS_SHELL_RE = _compile_alternation(DANGEROUS_SHELL_PATTERNS)
+
+
+def _has_symlink_component(norm_path: str) -> bool:
+    """Check whether any component of a normalized absolute path is a symlink"""
+    current = norm_path
+    while True:
+        if os.path.islink(current):
+            return True
+        parent = os.path.dirname(current)
+        if parent == current:
+            return False
+        current = parent
+
+
+def _canonicalize_path(path: str) -> Path:
+    """Canonicalize a path that contains no '..' components
+
+    Symlink-free paths are normalized lexically; full resolve() is only
+    needed when a component is a symlink.
+    """
+    norm_path = os.path.normpath(os.path.abspath(path))
+    if _has_symlink_component(norm_path):
+        return Path(path).resolve()
+    return Path(norm_path)
 
-@dataclass
-class RateLimitData:
-    """Rate limiting data for a client"""
 
-    client_id: str
-    call_timestamps: list[float] = field(default_factory=list)
+def _sanitize_log_value(key: str, value: object) -> str:
+    """Truncate long values and mask potential secrets for audit logging"""
+    if not isinstance(value, str):
+        return str(value)[:MAX_LOG_NON_STRING_LENGTH]
+    if len(value) > MAX_LOG_VALUE_LENGTH:
+        return value[:MAX_LOG_VALUE_LENGTH] + "..."
+    key_lower = key.lower()
+    if any(secret_word in key_lower for secret_word in SECRET_KEY_WORDS):
+        return "*" * min(len(value), 8)
+    return value
 
-    def add_call(self, timestamp: float) -> None:
-        """Add a new call timestamp"""
-        self.call_timestamps.append(timestamp)
 
-    def clean_old_calls(self, window_seconds: int = 60) -> None:
-        """Remove calls older than the window"""
-        now = time.time()
-        self.call_timestamps = [
-            ts for ts in self.call_timestamps if now - ts <= window_seconds
-        ]
+class _LazyJSON:
+    """Serialize a log entry only when it is first rendered, then reuse it"""
 
-    def get_recent_call_count(self) -> int:
-        """Get count of recent calls"""
-        return len(self.call_timestamps)
+    __slots__ = ("data", "_text")
+
+    def __init__(self, data: dict) -> None:
+        self.data = data
+        self._text: str | None = None
+
+    def __str__(self) -> str:
+        if self._text is None:
+            self._text = json.dumps(self.data)
+        return self._text
+
+
+@dataclass
+class TokenBucket:
+    """Token-bucket rate limiting state for a client"""
+
+    tokens: float
+    last_refill: float
+
+    def refill(self, now: float, capacity: float, rate: float) -> None:
+        """Add tokens earned since the last refill, capped at capacity"""
+        # Ignore backwards clock movement instead of draining the bucket
+        elapsed = max(0.0, now - self.last_refill)
+        self.tokens = min(capacity, self.tokens + elapsed * rate)
+        self.last_refill = max(self.last_refill, now)
+
+    def try_consume(self) -> bool:
+        """Take one token if available"""
+        if self.tokens < 1.0:
+            return False
+        self.tokens -= 1.0
+        return True
 
 
 class SecurityManager:
@@ -64,30 +213,20 @@ class SecurityManager:
     ) -> None:
         from .settings import SecurityLevel
 
-        self.rate_limits: dict[str, RateLimitData] = {}
+        self.rate_limits: dict[str, TokenBucket] = {}
         self.max_calls_per_minute = max_calls_per_minute
         self.max_sessions = DEFAULT_MAX_SESSIONS
         self.security_level = (
             security_level if security_level is not None else SecurityLevel.HIGH
         )
 
+        # Audit logging targets, looked up once instead of per event
+        self._security_logger = logging.getLogger("interactive-automation-mcp.security")
+        self._audit_log_path = os.environ.get("MCP_AUDIT_LOG_PATH") or None
+        self._audit_fp = self._open_audit_log()
+
         # Dangerous command patterns that should be blocked
-        self.blocked_command_patterns = {
-            r"\brm\s+-rf\s+/",  # rm -rf /
-            r"\bsudo\s+rm\s+-rf",  # sudo rm -rf
-            r"\bdd\s+if=/dev/zero",  # dd disk wipe
-            r"\bmkfs\.",  # filesystem formatting
-            r"\bfdisk\s",  # disk partitioning
-            r"\b:\(\)\{.*fork.*\}",  # fork bomb
-            r"\bchmod\s+777\s+/",  # dangerous permissions
-            r"\bchown\s+.*:.*\s+/",  # ownership changes on root
-            r"\biptables\s+-F",  # firewall flush
-            r"\bufw\s+--force\s+disable",  # firewall disable
-            r"\bsudo\s+passwd",  # password changes
-            r"\bsu\s+-",  # switch user
-            r"\bcrontab\s+-r",  # cron deletion
-            r"\bsystemctl\s+(stop|disable)\s+(ssh|network)",  # critical service shutdown
-        }
+        self.blocked_command_patterns = BLOCKED_COMMAND_PATTERNS
 
         # Allowed base directories for file operations
         self.allowed_base_paths = {
@@ -121,6 +260,41 @@ class SecurityManager:
             "LD_PRELOAD",
         }
 
+    @property
+    def allowed_base_paths(self) -> frozenset[str]:
+        """Allowed base directories; assign a new set to change them"""
+        return self._allowed_base_paths
+
+    @allowed_base_paths.setter
+    def allowed_base_paths(self, paths: Iterable[str]) -> None:
+        # Frozen so the resolved prefixes below can never go stale in place
+        self._allowed_base_paths = frozenset(paths)
+        self._allowed_base_prefixes = self._resolve_allowed_bases()
+
+    def _resolve_allowed_bases(self) -> tuple[tuple[str, str], ...]:
+        """Canonicalize allowed base paths once as (base, base + separator)"""
+        resolved = (str(Path(p).resolve()) for p in self._allowed_base_paths)
+        return tuple((base, base.rstrip(os.sep) + os.sep) for base in resolved)
+
+    @property
+    def blocked_paths(self) -> frozenset[str]:
+        """Blocked path prefixes; assign a new set to change them"""
+        return self._blocked_paths
+
+    @blocked_paths.setter
+    def blocked_paths(self, paths: Iterable[str]) -> None:
+        # Frozen so the compiled matchers below can never go stale in place
+        self._blocked_paths = frozenset(paths)
+        self._compile_blocked_paths()
+
+    def _compile_blocked_paths(self) -> None:
+        """Build prefix tuple and substring regex for blocked paths"""
+        # Longest first so the regex reports the most specific blocked path
+        ordered = sorted(self._blocked_paths, key=lambda p: (-len(p), p))
+        self._blocked_paths_tuple = tuple(ordered)
+        # "(?!)" never matches, so an empty blocked list blocks nothing
+        self._blocked_paths_re = re.compile("|".join(map(re.escape, ordered)) or "(?!)")
+
     def validate_tool_call(
         self, tool_name: str, arguments: dict, client_id: str = "default"
     ) -> bool:
@@ -150,10 +324,19 @@ class SecurityManager:
         ):
             return False
 
-        # Log successful validation
-        self._log_security_event("tool_call_allowed", tool_name, arguments, client_id)
+        # Log successful validation, skipping the entry build when nobody listens
+        if self._audit_enabled():
+            self._log_security_event(
+                "tool_call_allowed", tool_name, arguments, client_id
+            )
         return True
 
+    def _audit_enabled(self) -> bool:
+        """Check if security events would be emitted anywhere"""
+        if self._audit_log_path is not None:
+            return True
+        return self._security_logger.isEnabledFor(logging.INFO)
+
     def _validate_basic_input_only(
         self, tool_name: str, arguments: dict, client_id: str
     ) -> bool:
@@ -183,19 +366,11 @@ class SecurityManager:
         # Block only the most dangerous commands
         if "input_text" in arguments:
             input_text = arguments.get("input_text", "")
-            dangerous_patterns = [
-                r"\brm\s+-rf\s+/",  # rm -rf /
-                r"\bdd\s+if=/dev/zero",  # dd disk wipe
-                r"\bmkfs\.",  # filesystem formatting
-                r"\b:\(\)\{.*fork.*\}",  # fork bomb
-            ]
-
-            for pattern in dangerous_patterns:
-                if re.search(pattern, input_text, re.IGNORECASE):
-                    self._log_security_event(
-                        "blocked_dangerous_command", tool_name, arguments, client_id
-                    )
-                    return False
+            if MEDIUM_DANGEROUS_RE.search(input_text):
+                self._log_security_event(
+                    "blocked_dangerous_command", tool_name, arguments, client_id
+                )
+                return False
 
         return True
 
@@ -296,39 +471,19 @@ class SecurityManager:
 
     def _validate_input(self, value: str) -> bool:
         """Validate input strings for basic injection attempts"""
-        # Check for null bytes, control characters, and DEL character
-        if "\x00" in value or any(
-            (ord(c) < CONTROL_CHAR_THRESHOLD and c not in "\t\n\r")
-            or ord(c) == DEL_CHAR_CODE
-            for c in value
-        ):
-            return False
-
-        # Check for problematic bytes in the 128-255 range that are often binary/control sequences
-        # This catches \x80, \x81, \xff, \xfe from the test but allows proper Unicode
-        for c in value:
-            ord_c = ord(c)
-            if (
-                C1_CONTROL_START <= ord_c <= C1_CONTROL_END
-                or ord_c in PROBLEMATIC_HIGH_BYTES
-            ):
+        # Check for null bytes, control characters, DEL, and problematic 128-255
+        # codepoints (proper Unicode is unaffected); this runs before the
+        # costlier injection scan so bad characters fail fast
+        if len(value) < SHORT_INPUT_LENGTH:
+            if DISALLOWED_CHARS_RE.search(value):
                 return False
+        # translate() deletes them in C; any length change means a hit
+        elif len(value.translate(DISALLOWED_CHARS_TABLE)) != len(value):
+            return False
 
         # Check for potential shell injection patterns
-        injection_patterns = {
-            r";\s*rm\s",
-            r";\s*cat\s",
-            r";\s*curl\s",
-            r";\s*wget\s",
-            r"\$\([^)]*\)",
-            r"`[^`]*`",
-            r"\${[^}]*}",
-            r"\\x[0-9a-fA-F]{2}",  # hex escape sequences
-        }
-
-        for pattern in injection_patterns:
-            if re.search(pattern, value, re.IGNORECASE):
-                return False
+        if INJECTION_RE.search(value):
+            return False
 
         return True
 
@@ -359,15 +514,8 @@ class SecurityManager:
             return False
 
         # Additional checks for interactive input
-        dangerous_patterns = {
-            r"sudo\s+.*",  # sudo commands
-            r"su\s+-",  # switch user
-            r"passwd\s*$",  # password command
-        }
-
-        for pattern in dangerous_patterns:
-            if re.search(pattern, input_text, re.IGNORECASE):
-                return False
+        if DANGEROUS_INPUT_RE.search(input_text):
+            return False
 
         return True
 
@@ -439,16 +587,15 @@ class SecurityManager:
 
     def _validate_command(self, command: str) -> bool:
         """Validate command against dangerous patterns"""
-        if not command or not command.strip():
+        command_stripped = command.strip() if command else ""
+        if not command_stripped:
             return False
 
-        command_lower = command.lower().strip()
-
-        # Check against blocked patterns
-        for pattern in self.blocked_command_patterns:
-            if re.search(pattern, command_lower, re.IGNORECASE):
-                logger.error(f"Blocked dangerous command pattern: {pattern}")
-                return False
+        # Check against blocked patterns (compiled with IGNORECASE)
+        match = BLOCKED_COMMAND_RE.search(command_stripped)
+        if match:
+            logger.error(f"Blocked dangerous command pattern: {match.group(0)}")
+            return False
 
         # Block commands that try to modify system files
         system_paths = ["/etc/", "/boot/", "/sys/", "/proc/sys/"]
@@ -458,15 +605,15 @@ class SecurityManager:
                 return False
 
         # Block commands that try to access blocked paths directly
-        for blocked_path in self.blocked_paths:
-            if blocked_path in command:
-                logger.error(f"Blocked access to restricted path: {blocked_path}")
-                return False
+        match = self._blocked_paths_re.search(command)
+        if match:
+            logger.error(f"Blocked access to restricted path: {match.group(0)}")
+            return False
 
         # Additional checks for specific dangerous commands
-        dangerous_commands = ["format", "fdisk", "parted", "mkfs", "wipefs"]
-        first_word = command_lower.split()[0] if command_lower.split() else ""
-        if first_word in dangerous_commands:
+        # Only the first token matters, so split once and lowercase just that
+        first_word = command_stripped.split(None, 1)[0].lower()
+        if first_word in DANGEROUS_FIRST_WORDS:
             logger.error(f"Blocked dangerous command: {first_word}")
             return False
 
@@ -515,18 +662,10 @@ class SecurityManager:
             return False
 
         # Block obvious command injection attempts
-        dangerous_patterns = [
-            r"[;&|`$()]",  # Shell metacharacters
-            r"\.\.\/",  # Path traversal
-            r"rm\s",  # Dangerous commands
-            r"sudo\s",
-            r"su\s",
-        ]
-
-        for pattern in dangerous_patterns:
-            if re.search(pattern, shell_lower):
-                logger.error(f"Blocked shell with dangerous pattern: {pattern}")
-                return False
+        match = DANGEROUS_SHELL_RE.search(shell_lower)
+        if match:
+            logger.error(f"Blocked shell with dangerous pattern: {match.group(0)}")
+            return False
 
         return True
 
@@ -535,14 +674,16 @@ class SecurityManager:
         if not path:
             return False
 
+        # Every call resolves the path again: symlinks and the working
+        # directory can change between calls, so only the bases are cached
         try:
-            resolved_path = Path(path).resolve()
-            path_str = str(resolved_path)
-
             # Check basic path security
             if not self._check_path_traversal(path):
                 return False
 
+            resolved_path = _canonicalize_path(path)
+            path_str = str(resolved_path)
+
             # Check against blocked resources
             if not self._check_blocked_paths_and_extensions(path_str, resolved_path):
                 return False
@@ -559,7 +700,9 @@ class SecurityManager:
 
     def _check_path_traversal(self, path: str) -> bool:
         """Check for path traversal attempts"""
-        if ".." in path or path.startswith("../"):
+        # Match whole components so names like "foo..bar" are not flagged; the
+        # raw path is split because normpath() would collapse "link/.." lexically
+        if ".." in path.split(os.sep):
             logger.error(f"Path traversal attempt detected: {path}")
             return False
         return True
@@ -569,10 +712,9 @@ class SecurityManager:
     ) -> bool:
         """Check against blocked paths and file extensions"""
         # Check against blocked paths
-        for blocked in self.blocked_paths:
-            if path_str.startswith(blocked) or resolved_path == Path(blocked):
-                logger.error(f"Access to blocked path: {path_str}")
-                return False
+        if path_str.startswith(self._blocked_paths_tuple):
+            logger.error(f"Access to blocked path: {path_str}")
+            return False
 
         # Check file extensions
         if resolved_path.suffix.lower() in self.blocked_extensions:
@@ -583,41 +725,36 @@ class SecurityManager:
 
     def _check_allowed_directories(self, resolved_path: Path) -> bool:
         """Check if path is within allowed base directories"""
-        for allowed_base in self.allowed_base_paths:
-            try:
-                resolved_path.relative_to(Path(allowed_base).resolve())
+        path_str = str(resolved_path)
+        for base, prefix in self._allowed_base_prefixes:
+            if path_str == base or path_str.startswith(prefix):
                 return True
-            except ValueError:
-                continue
 
         logger.error(f"Path outside allowed directories: {resolved_path}")
         return False
 
     def _check_rate_limit(self, client_id: str = "default") -> bool:
         """Check if client is within rate limits"""
-        now = time.time()
+        now = time.monotonic()
+        capacity = float(self.max_calls_per_minute)
 
-        # Get or create rate limit data for client
-        if client_id not in self.rate_limits:
-            self.rate_limits[client_id] = RateLimitData(client_id)
+        # Get or create a full bucket for the client
+        bucket = self.rate_limits.get(client_id)
+        if bucket is None:
+            bucket = self.rate_limits[client_id] = TokenBucket(capacity, now)
 
-        rate_data = self.rate_limits[client_id]
-
-        # Clean old entries
-        rate_data.clean_old_calls()
-
-        # Check limit
-        if rate_data.get_recent_call_count() >= self.max_calls_per_minute:
-            return False
-
-        # Record this call
-        rate_data.add_call(now)
-        return True
+        # Refill at max_calls_per_minute tokens per minute, then spend one
+        bucket.refill(now, capacity, capacity / RATE_LIMIT_WINDOW_SECONDS)
+        return bucket.try_consume()
 
     def _log_security_event(
         self, event_type: str, tool_name: str, arguments: dict, client_id: str
     ) -> None:
         """Log security events for audit purposes"""
+        # Skip sanitizing and serializing when nothing would record the event
+        if not self._audit_enabled():
+            return
+
         try:
             # Create security audit log entry
             log_entry = {
@@ -628,43 +765,63 @@ class SecurityManager:
                 "arguments": self._sanitize_for_logging(arguments),
             }
 
+            # Dumped at most once, and only if a handler or the audit file needs it
+            serialized = _LazyJSON(log_entry)
+
             # Log to security logger with structured data
-            security_logger = logging.getLogger("interactive-automation-mcp.security")
-            security_logger.info(json.dumps(log_entry))
+            self._security_logger.info("%s", serialized)
 
             # Also write to security audit file if configured
-            self._write_audit_log(log_entry)
+            self._write_audit_log(log_entry, serialized)
 
         except Exception as e:
             logger.error(f"Failed to log security event: {e}")
 
     def _sanitize_for_logging(self, data: dict) -> dict:
         """Sanitize sensitive data for logging"""
-        sanitized = {}
-        for key, value in data.items():
-            if isinstance(value, str):
-                # Truncate long values and mask potential secrets
-                if len(value) > MAX_LOG_VALUE_LENGTH:
-                    sanitized[key] = value[:MAX_LOG_VALUE_LENGTH] + "..."
-                elif any(
-                    secret_word in key.lower()
-                    for secret_word in ["password", "token", "key", "secret"]
-                ):
-                    sanitized[key] = "*" * min(len(value), 8)
-                else:
-                    sanitized[key] = value
-            else:
-                sanitized[key] = str(value)[:100]
-        return sanitized
-
-    def _write_audit_log(self, log_entry: dict) -> None:
+        return {key: _sanitize_log_value(key, value) for key, value in data.items()}
+
+    def _open_audit_log(self) -> TextIO | None:
+        """Open the audit log once in line-buffered append mode, if configured"""
+        if not self._audit_log_path:
+            return None
+
+        try:
+            audit_dir = os.path.dirname(self._audit_log_path)
+            if audit_dir:
+                os.makedirs(audit_dir, exist_ok=True)
+            audit_fp = open(self._audit_log_path, "a", buffering=1)
+        except OSError as e:
+            logger.debug(f"Could not open audit log file: {e}")
+            return None
+
+        return audit_fp
+
+    def close(self) -> None:
+        """Close the audit log file, if one was opened"""
+        if self._audit_fp is not None:
+            self._audit_fp.close()
+            self._audit_fp = None
+
+    def _write_audit_log(
+        self, log_entry: dict, serialized: _LazyJSON | None = None
+    ) -> None:
         """Write audit log to file if audit logging is enabled"""
+        audit_fp = self._audit_fp
+        if audit_fp is None:
+            return
+
         try:
-            audit_log_path = os.environ.get("MCP_AUDIT_LOG_PATH")
-            if audit_log_path:
-                os.makedirs(os.path.dirname(audit_log_path), exist_ok=True)
-                with open(audit_log_path, "a") as f:
-                    f.write(json.dumps(log_entry) + "\n")
+            line = f"{serialized or _LazyJSON(log_entry)}\n"
+            if fcntl is None:
+                audit_fp.write(line)
+                return
+            # Lock so entries from several server processes never interleave
+            fcntl.flock(audit_fp, fcntl.LOCK_EX)
+            try:
+                audit_fp.write(line)
+            finally:
+                fcntl.flock(audit_fp, fcntl.LOCK_UN)
         except Exception as e:
             logger.debug(f"Could not write to audit log file: {e}")
 
@@ -1,8 +1,9 @@
 import asyncio
+import itertools
 import logging
+import secrets
 import time
-import uuid
-from dataclasses import dataclass, field
+from dataclasses import dataclass
 from enum import Enum
 from typing import TYPE_CHECKING, Any, Optional
 
@@ -11,6 +12,15 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+# Upper bound on concurrent liveness probes and destroys per cleanup pass
+CLEANUP_BATCH_SIZE = 100
+# Lock stripes guarding per-session teardown (power of two for masking)
+SESSION_LOCK_STRIPES = 16
+# last_activity is only rewritten once it is at least this stale
+LAST_ACTIVITY_RESOLUTION_SECONDS = 1.0
+# Interval between dead-session scans
+CLEANUP_INTERVAL_SECONDS = 5.0
+
 
 class SessionState(Enum):
     INITIALIZING = "initializing"
@@ -20,7 +30,7 @@ class SessionState(Enum):
     TERMINATED = "terminated"
 
 
-@dataclass
+@dataclass(slots=True)
 class SessionMetadata:
     session_id: str
     command: str
@@ -28,17 +38,40 @@ class SessionMetadata:
     last_activity: float
     state: SessionState
     timeout: int
-    user_data: dict[str, Any] = field(default_factory=dict)
+    # Allocated by the first writer; most sessions never store user data
+    user_data: dict[str, Any] | None = None
+
+
+class SessionEntry:
+    """A session and its metadata, stored together under one key"""
+
+    __slots__ = ("session", "metadata")
+
+    def __init__(self, session: "InteractiveSession", metadata: SessionMetadata):
+        self.session = session
+        self.metadata = metadata
 
 
 class SessionManager:
     """Manages interactive terminal sessions with lifecycle tracking"""
 
-    def __init__(self, max_sessions: int = 50, default_timeout: int = 3600):
-        self.sessions: dict[str, InteractiveSession] = {}
-        self.session_metadata: dict[str, SessionMetadata] = {}
+    def __init__(
+        self,
+        max_sessions: int = 50,
+        default_timeout: int = 3600,
+        web_enabled: bool = False,
+    ):
+        self._entries: dict[str, SessionEntry] = {}
+        # Rebuilt lazily by list_sessions after sessions are added or removed
+        self._snapshot: tuple[SessionMetadata, ...] | None = None
+        self._session_class: type[InteractiveSession] | None = None
+        self._id_counter = itertools.count()
+        # Striped rather than global so teardowns of unrelated sessions overlap
+        self._lock_stripes = [asyncio.Lock() for _ in range(SESSION_LOCK_STRIPES)]
         self.max_sessions = max_sessions
         self.default_timeout = default_timeout
+        # Terminal windows are only closed on destroy when the web UI is off
+        self.web_enabled = web_enabled
         self._cleanup_task: asyncio.Task[None] | None = None
         self._shutdown_event: asyncio.Event | None = None
         self._cleanup_task_started = False
@@ -57,6 +90,8 @@ class SessionManager:
         # Ensure cleanup task is running now that we have an event loop
         self._ensure_cleanup_task_running()
 
+        # Nothing is awaited between the limit check and storing the entry, so
+        # concurrent creations on the event loop cannot overshoot max_sessions
         self._validate_session_creation()
         session_id = self._generate_session_id(command)
         session = self._create_session_object(
@@ -74,7 +109,7 @@ class SessionManager:
 
     def _validate_session_creation(self) -> None:
         """Validate if a new session can be created"""
-        if len(self.sessions) >= self.max_sessions:
+        if len(self._entries) >= self.max_sessions:
             logger.warning(
                 f"Maximum sessions ({self.max_sessions}) reached, cannot create new session"
             )
@@ -82,7 +117,9 @@ class SessionManager:
 
     def _generate_session_id(self, command: str) -> str:
         """Generate a unique session ID"""
-        session_id = f"session_{uuid.uuid4().hex[:8]}"
+        # The counter keeps ids unique in this process; the random suffix keeps
+        # them unguessable and clear of tmux sessions left by earlier runs
+        session_id = f"session_{next(self._id_counter):x}{secrets.token_hex(4)}"
         logger.info(f"Creating session {session_id} for command: {command}")
         return session_id
 
@@ -95,10 +132,14 @@ class SessionManager:
         working_directory: str | None,
     ) -> "InteractiveSession":
         """Create the InteractiveSession object"""
-        # Import here to avoid circular imports
-        from .interactive_session import InteractiveSession
+        session_class = self._session_class
+        if session_class is None:
+            # Import here to avoid circular imports; resolved once per manager
+            from .interactive_session import InteractiveSession
+
+            session_class = self._session_class = InteractiveSession
 
-        return InteractiveSession(
+        return session_class(
             session_id=session_id,
             command=command,
             timeout=timeout or self.default_timeout,
@@ -114,15 +155,17 @@ class SessionManager:
         timeout: int | None,
     ) -> None:
         """Store session and metadata"""
-        self.sessions[session_id] = session
-        self.session_metadata[session_id] = SessionMetadata(
+        now = time.time()
+        metadata = SessionMetadata(
             session_id=session_id,
             command=command,
-            created_at=time.time(),
-            last_activity=time.time(),
+            created_at=now,
+            last_activity=now,
             state=SessionState.INITIALIZING,
             timeout=timeout or self.default_timeout,
         )
+        self._entries[session_id] = SessionEntry(session, metadata)
+        self._invalidate_snapshot()
 
     async def _initialize_session(
         self, session_id: str, session: "InteractiveSession"
@@ -134,41 +177,45 @@ class SessionManager:
         # This ensures the shell is ready to accept commands
         await asyncio.sleep(0.5)  # Allow time for shell startup scripts
 
-        self.session_metadata[session_id].state = SessionState.ACTIVE
+        self._entries[session_id].metadata.state = SessionState.ACTIVE
         logger.info(f"Session {session_id} successfully initialized and active")
 
     def _cleanup_failed_session(self, session_id: str, error: Exception) -> None:
         """Clean up a failed session"""
         logger.error(f"Failed to initialize session {session_id}: {error}")
-        if session_id in self.sessions:
-            del self.sessions[session_id]
-        if session_id in self.session_metadata:
-            del self.session_metadata[session_id]
+        self._entries.pop(session_id, None)
+        self._invalidate_snapshot()
 
     async def get_session(self, session_id: str) -> Optional["InteractiveSession"]:
         """Retrieve a session by ID"""
-        if session_id in self.sessions:
-            # Update last activity
-            self.session_metadata[session_id].last_activity = time.time()
-            logger.debug(f"Retrieved session {session_id}, updated last activity")
-            return self.sessions[session_id]
+        entry = self._entries.get(session_id)
+        if entry is not None:
+            # Update last activity; bursts of lookups share one timestamp
+            now = time.time()
+            metadata = entry.metadata
+            if now - metadata.last_activity >= LAST_ACTIVITY_RESOLUTION_SECONDS:
+                metadata.last_activity = now
+            logger.debug(f"Retrieved session {session_id}")
+            return entry.session
         logger.debug(f"Session {session_id} not found")
         return None
 
+    async def get_session_metadata(self, session_id: str) -> SessionMetadata | None:
+        """Retrieve a session's metadata by ID without counting it as activity"""
+        entry = self._entries.get(session_id)
+        return entry.metadata if entry is not None else None
+
     async def _close_terminal_window_if_needed(
         self, session_id: str, close_terminal_window: bool
     ) -> None:
         """Close terminal window if web is disabled and requested"""
-        if not close_terminal_window:
+        if not close_terminal_window or self.web_enabled:
             return
 
         try:
-            from .settings import ServerConfig
             from .terminal_utils import close_terminal_window as close_window_func
 
-            config = ServerConfig()
-            if not config.web_enabled:
-                await close_window_func(session_id)
+            await close_window_func(session_id)
         except Exception as e:
             logger.warning(
                 f"Error closing terminal window for session {session_id}: {e}"
@@ -186,31 +233,74 @@ class SessionManager:
 
     def _cleanup_session_from_manager(self, session_id: str) -> None:
         """Remove session from manager storage"""
-        del self.sessions[session_id]
-        del self.session_metadata[session_id]
+        # Concurrent destroys of the same session may race to get here
+        self._entries.pop(session_id, None)
+        self._invalidate_snapshot()
         logger.info(f"Session {session_id} removed from manager")
 
     async def destroy_session(
         self, session_id: str, close_terminal_window: bool = True
     ) -> bool:
         """Terminate and cleanup a session"""
-        if session_id not in self.sessions:
-            logger.warning(f"Cannot destroy session {session_id}: not found")
-            return False
-
-        logger.info(f"Destroying session {session_id}")
-        session = self.sessions[session_id]
-
-        await self._close_terminal_window_if_needed(session_id, close_terminal_window)
-        await self._terminate_session_process(session_id, session)
-        self._cleanup_session_from_manager(session_id)
-        return True
-
-    async def list_sessions(self) -> list[SessionMetadata]:
+        # Concurrent destroys of one session (tool call vs. cleanup loop) must
+        # tear it down once; the loser finds the entry gone and reports so
+        async with self._lock_for(session_id):
+            entry = self._entries.get(session_id)
+            if entry is None:
+                logger.warning(f"Cannot destroy session {session_id}: not found")
+                return False
+
+            logger.info(f"Destroying session {session_id}")
+            session = entry.session
+
+            await self._close_terminal_window_if_needed(
+                session_id, close_terminal_window
+            )
+            await self._terminate_session_process(session_id, session)
+            self._cleanup_session_from_manager(session_id)
+            return True
+
+    def _lock_for(self, session_id: str) -> asyncio.Lock:
+        """Return the lock stripe guarding a session id"""
+        return self._lock_stripes[hash(session_id) & (SESSION_LOCK_STRIPES - 1)]
+
+    async def destroy_all(self, close_terminal_window: bool = True) -> int:
+        """Terminate every session concurrently, returning how many were destroyed"""
+        # Snapshot first: destroy_session mutates the entry map as it finishes
+        session_ids = list(self._entries)
+        if not session_ids:
+            return 0
+
+        results = await asyncio.gather(
+            *(
+                self.destroy_session(session_id, close_terminal_window)
+                for session_id in session_ids
+            ),
+            return_exceptions=True,
+        )
+        for session_id, result in zip(session_ids, results, strict=True):
+            if isinstance(result, BaseException):
+                logger.error(f"Error destroying session {session_id}: {result}")
+                # Never leave a half-destroyed session registered
+                self._entries.pop(session_id, None)
+                self._invalidate_snapshot()
+
+        destroyed = sum(result is True for result in results)
+        logger.info(f"Destroyed {destroyed} of {len(session_ids)} sessions")
+        return destroyed
+
+    async def list_sessions(self) -> tuple[SessionMetadata, ...]:
         """List all active sessions"""
-        sessions = list(self.session_metadata.values())
-        logger.debug(f"Listed {len(sessions)} active sessions")
-        return sessions
+        # Metadata objects are shared, so state and activity updates show
+        # through; only adding or removing a session invalidates the snapshot
+        if self._snapshot is None:
+            self._snapshot = tuple(entry.metadata for entry in self._entries.values())
+        logger.debug(f"Listed {len(self._snapshot)} active sessions")
+        return self._snapshot
+
+    def _invalidate_snapshot(self) -> None:
+        """Drop the cached session listing after the entry map changes"""
+        self._snapshot = None
 
     def _ensure_cleanup_task_running(self) -> None:
         """Ensure the background cleanup task is running (lazy initialization)"""
@@ -243,19 +333,48 @@ class SessionManager:
 
     def _mark_session_as_terminated(self, session_id: str) -> None:
         """Mark session metadata as terminated"""
-        if session_id in self.session_metadata:
-            self.session_metadata[session_id].state = SessionState.TERMINATED
+        entry = self._entries.get(session_id)
+        if entry is not None:
+            entry.metadata.state = SessionState.TERMINATED
 
-    def _find_dead_sessions(self) -> list[str]:
+    async def _find_dead_sessions(self) -> list[str]:
         """Find all dead sessions that need cleanup"""
         dead_sessions = []
-        for session_id, session in list(self.sessions.items()):
-            if not self._check_session_health(session_id, session):
-                logger.info(f"Detected dead session {session_id}")
-                dead_sessions.append(session_id)
-                self._mark_session_as_terminated(session_id)
+        # Sessions still starting up are not alive yet and must not be reaped;
+        # members are singletons, so bind once and compare by identity
+        initializing = SessionState.INITIALIZING
+        items = [
+            (session_id, entry.session)
+            for session_id, entry in self._entries.items()
+            if entry.metadata.state is not initializing
+        ]
+        for start in range(0, len(items), CLEANUP_BATCH_SIZE):
+            batch = items[start : start + CLEANUP_BATCH_SIZE]
+            # Probe in worker threads so tmux round-trips overlap
+            results = await asyncio.gather(
+                *(
+                    asyncio.to_thread(self._check_session_health, session_id, session)
+                    for session_id, session in batch
+                )
+            )
+            for (session_id, _), alive in zip(batch, results, strict=True):
+                if not alive:
+                    logger.info(f"Detected dead session {session_id}")
+                    dead_sessions.append(session_id)
+                    self._mark_session_as_terminated(session_id)
         return dead_sessions
 
+    async def _destroy_dead_sessions(self, dead_sessions: list[str]) -> None:
+        """Destroy dead sessions concurrently in bounded batches"""
+        for start in range(0, len(dead_sessions), CLEANUP_BATCH_SIZE):
+            batch = dead_sessions[start : start + CLEANUP_BATCH_SIZE]
+            for session_id in batch:
+                logger.info(f"Auto-cleaning up dead session {session_id}")
+            await asyncio.gather(
+                *(self.destroy_session(session_id) for session_id in batch),
+                return_exceptions=True,
+            )
+
     async def _cleanup_dead_sessions(self) -> None:
         """Background task to monitor and cleanup dead sessions"""
         # Ensure shutdown event is initialized
@@ -264,12 +383,10 @@ class SessionManager:
 
         while not self._shutdown_event.is_set():
             try:
-                await asyncio.sleep(5)  # Check for dead sessions every 5 seconds
+                await asyncio.sleep(CLEANUP_INTERVAL_SECONDS)
 
-                dead_sessions = self._find_dead_sessions()
-                for session_id in dead_sessions:
-                    logger.info(f"Auto-cleaning up dead session {session_id}")
-                    await self.destroy_session(session_id)
+                dead_sessions = await self._find_dead_sessions()
+                await self._destroy_dead_sessions(dead_sessions)
 
             except asyncio.CancelledError:
                 logger.info("Cleanup task cancelled")
@@ -295,8 +412,6 @@ class SessionManager:
                 pass
 
         # Destroy all remaining sessions
-        session_ids = list(self.sessions.keys())
-        for session_id in session_ids:
-            await self.destroy_session(session_id)
+        await self.destroy_all()
 
         logger.info("SessionManager shutdown complete")
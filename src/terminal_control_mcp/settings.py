@@ -5,9 +5,10 @@ All configuration options loaded from TOML file only
 """
 
 from enum import Enum
+from functools import cache, cached_property
 from typing import Any
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 from pydantic_settings import (
     BaseSettings,
     PydanticBaseSettingsSource,
@@ -28,22 +29,30 @@ class SecurityLevel(Enum):
 class TerminalEmulator(BaseModel):
     """Terminal emulator configuration"""
 
+    model_config = ConfigDict(frozen=True)
+
     name: str
-    command: list[str]
+    command: tuple[str, ...]
 
 
 class WebSettings(BaseModel):
     """Web server configuration"""
 
+    model_config = ConfigDict(frozen=True)
+
     enabled: bool
     host: str
     port: int
     external_host: str | None = None
+    profile: bool = False
+    ws_compression: bool = True
 
 
 class SecuritySettings(BaseModel):
     """Security configuration"""
 
+    model_config = ConfigDict(frozen=True)
+
     level: SecurityLevel
     max_calls_per_minute: int
     max_sessions: int
@@ -52,6 +61,8 @@ class SecuritySettings(BaseModel):
 class SessionSettings(BaseModel):
     """Session configuration"""
 
+    model_config = ConfigDict(frozen=True)
+
     default_shell: str
     timeout: int
     isolate_history: bool = True
@@ -61,12 +72,16 @@ class SessionSettings(BaseModel):
 class LoggingSettings(BaseModel):
     """Logging configuration"""
 
+    model_config = ConfigDict(frozen=True)
+
     level: str
 
 
 class TerminalSettings(BaseModel):
     """Terminal configuration"""
 
+    model_config = ConfigDict(frozen=True)
+
     width: int
     height: int
     close_timeout: float
@@ -74,14 +89,17 @@ class TerminalSettings(BaseModel):
     polling_interval: float
     send_input_delay: float
     screen_content_delay: float
-    emulators: list[TerminalEmulator]
+    emulators: tuple[TerminalEmulator, ...]
 
 
 class ServerConfig(BaseSettings):
     """Central configuration for the MCP server"""
 
+    # Frozen, like every section, so the cached aliases below cannot go stale;
+    # reload_config() builds a new instance to pick up file changes
     model_config = SettingsConfigDict(
         toml_file=["terminal-control.toml", "~/.config/terminal-control.toml"],
+        frozen=True,
     )
 
     web: WebSettings = WebSettings(
@@ -109,18 +127,18 @@ class ServerConfig(BaseSettings):
         polling_interval=0.05,
         send_input_delay=0.1,
         screen_content_delay=1.0,
-        emulators=[
-            TerminalEmulator(name="gnome-terminal", command=["gnome-terminal", "--"]),
-            TerminalEmulator(name="konsole", command=["konsole", "-e"]),
-            TerminalEmulator(name="xfce4-terminal", command=["xfce4-terminal", "-e"]),
-            TerminalEmulator(name="io.elementary.terminal", command=["io.elementary.terminal", "-e"]),
-            TerminalEmulator(name="x-terminal-emulator", command=["x-terminal-emulator", "-e"]),
-            TerminalEmulator(name="xterm", command=["xterm", "-e"]),
-            TerminalEmulator(name="Terminal", command=["open", "-a", "Terminal"]),
-            TerminalEmulator(name="alacritty", command=["alacritty", "-e"]),
-            TerminalEmulator(name="kitty", command=["kitty"]),
-            TerminalEmulator(name="terminator", command=["terminator", "-e"]),
-        ]
+        emulators=(
+            TerminalEmulator(name="gnome-terminal", command=("gnome-terminal", "--")),
+            TerminalEmulator(name="konsole", command=("konsole", "-e")),
+            TerminalEmulator(name="xfce4-terminal", command=("xfce4-terminal", "-e")),
+            TerminalEmulator(name="io.elementary.terminal", command=("io.elementary.terminal", "-e")),
+            TerminalEmulator(name="x-terminal-emulator", command=("x-terminal-emulator", "-e")),
+            TerminalEmulator(name="xterm", command=("xterm", "-e")),
+            TerminalEmulator(name="Terminal", command=("open", "-a", "Terminal")),
+            TerminalEmulator(name="alacritty", command=("alacritty", "-e")),
+            TerminalEmulator(name="kitty", command=("kitty",)),
+            TerminalEmulator(name="terminator", command=("terminator", "-e")),
+        )
     )
 
     @classmethod
@@ -137,91 +155,113 @@ class ServerConfig(BaseSettings):
         _ = init_settings, env_settings, dotenv_settings, file_secret_settings
         return (TomlConfigSettingsSource(settings_cls),)
 
-    # Backward compatibility properties
-    @property
+    # Backward compatibility aliases; cached on first access so later reads are
+    # plain attribute loads
+    @cached_property
     def web_enabled(self) -> bool:
         return self.web.enabled
 
-    @property
+    @cached_property
     def web_host(self) -> str:
         return self.web.host
 
-    @property
+    @cached_property
     def web_port(self) -> int:
         return self.web.port
 
-    @property
+    @cached_property
     def web_auto_port(self) -> bool:
         return True  # This was hardcoded in the old system
 
-    @property
+    @cached_property
     def external_web_host(self) -> str | None:
         return self.web.external_host
 
-    @property
+    @cached_property
+    def web_profile(self) -> bool:
+        return self.web.profile
+
+    @cached_property
+    def web_ws_compression(self) -> bool:
+        return self.web.ws_compression
+
+    @cached_property
     def security_level(self) -> SecurityLevel:
         return self.security.level
 
-    @property
+    @cached_property
     def max_calls_per_minute(self) -> int:
         return self.security.max_calls_per_minute
 
-    @property
+    @cached_property
     def max_sessions(self) -> int:
         return self.security.max_sessions
 
-    @property
+    @cached_property
     def default_shell(self) -> str:
         return self.session.default_shell
 
-    @property
+    @cached_property
     def session_timeout(self) -> int:
         return self.session.timeout
 
-    @property
+    @cached_property
     def isolate_history(self) -> bool:
         return self.session.isolate_history
 
-    @property
+    @cached_property
     def history_file_prefix(self) -> str:
         return self.session.history_file_prefix
 
-    @property
+    @cached_property
     def log_level(self) -> str:
         return self.logging.level
 
-    @property
+    @cached_property
     def terminal_width(self) -> int:
         return self.terminal.width
 
-    @property
+    @cached_property
     def terminal_height(self) -> int:
         return self.terminal.height
 
-    @property
+    @cached_property
     def terminal_close_timeout(self) -> float:
         return self.terminal.close_timeout
 
-    @property
+    @cached_property
     def terminal_process_check_timeout(self) -> float:
         return self.terminal.process_check_timeout
 
-    @property
+    @cached_property
     def terminal_polling_interval(self) -> float:
         return self.terminal.polling_interval
 
-    @property
+    @cached_property
     def terminal_send_input_delay(self) -> float:
         return self.terminal.send_input_delay
 
-    @property
+    @cached_property
     def terminal_screen_content_delay(self) -> float:
         return self.terminal.screen_content_delay
 
-    @property
-    def terminal_emulators(self) -> list[dict[str, Any]]:
+    @cached_property
+    def terminal_emulators(self) -> tuple[dict[str, Any], ...]:
         """Convert TerminalEmulator models to dicts for backward compatibility"""
-        return [{"name": e.name, "command": e.command} for e in self.terminal.emulators]
+        # Built once per config; the sections are frozen and commands are
+        # tuples, so the cached result cannot go stale
+        return tuple(
+            {"name": e.name, "command": e.command} for e in self.terminal.emulators
+        )
+
+
+@cache
+def get_config() -> ServerConfig:
+    """Return the shared server configuration, loading the TOML file once"""
+    return ServerConfig()
 
 
-# No global config instance - each module should create ServerConfig() when needed
+def reload_config() -> ServerConfig:
+    """Discard the shared configuration and load it again"""
+    get_config.cache_clear()
+    return get_config()
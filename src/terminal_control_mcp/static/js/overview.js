@@ -3,6 +3,8 @@
 const protocol = window.location.protocol === 'https:' ? 'wss:' : 'ws:';
 const wsUrl = `${protocol}//${window.location.host}/overview`;
 let ws = null;
+// Last update rendered; the server repeats it every few seconds
+let lastUpdate = null;
 
 function connectOverviewWebSocket() {
     try {
@@ -13,6 +15,11 @@ function connectOverviewWebSocket() {
         };
         
         ws.onmessage = function(event) {
+            // Identical updates would rebuild the same DOM
+            if (event.data === lastUpdate) {
+                return;
+            }
+            lastUpdate = event.data;
             const data = JSON.parse(event.data);
             if (data.type === 'session_update') {
                 updateSessionList(data.sessions);
@@ -33,6 +40,15 @@ function connectOverviewWebSocket() {
     }
 }
 
+function escapeHtml(value) {
+    return String(value)
+        .replace(/&/g, '&amp;')
+        .replace(/</g, '&lt;')
+        .replace(/>/g, '&gt;')
+        .replace(/"/g, '&quot;')
+        .replace(/'/g, '&#39;');
+}
+
 function updateSessionList(sessions) {
     const container = document.querySelector('.container');
     
@@ -43,14 +59,18 @@ function updateSessionList(sessions) {
             <div class="empty-state"><p>No active sessions</p></div>
         `;
     } else {
-        const sessionRows = sessions.map(session => `
+        // Commands are arbitrary text, so escape everything like the server template does
+        const sessionRows = sessions.map(session => {
+            const state = escapeHtml(session.state);
+            return `
             <tr>
-                <td><code>${session.session_id}</code></td>
-                <td><code>${session.command}</code></td>
-                <td><span class="status status-${session.state.toLowerCase()}">${session.state}</span></td>
-                <td><a href="${session.url}" class="btn btn-primary">View Session</a></td>
+                <td><code>${escapeHtml(session.session_id)}</code></td>
+                <td><code>${escapeHtml(session.command)}</code></td>
+                <td><span class="status status-${state.toLowerCase()}">${state}</span></td>
+                <td><a href="${escapeHtml(session.url)}" class="btn btn-primary">View Session</a></td>
             </tr>
-        `).join('');
+        `;
+        }).join('');
         
         container.innerHTML = `
             <h1>Terminal Control Sessions</h1>
@@ -37,18 +37,28 @@ terminal.open(document.getElementById('terminal'));
 const protocol = window.location.protocol === 'https:' ? 'wss:' : 'ws:';
 const wsUrl = `${protocol}//${window.location.host}/session/${sessionId}/pty`;
 let ws = null;
+// Stream bytes written so far; a reconnect resumes from here
+let received = 0;
 
 function connectWebSocket() {
     try {
-        ws = new WebSocket(wsUrl);
+        ws = new WebSocket(`${wsUrl}?offset=${received}`);
+        // Terminal output arrives as raw UTF-8 bytes; errors as text
+        ws.binaryType = 'arraybuffer';
         
         ws.onopen = function() {
             console.log('Terminal WebSocket connected');
         };
         
         ws.onmessage = function(event) {
-            // Write incremental stream data directly to terminal
-            terminal.write(event.data);
+            // Write incremental stream data directly to terminal; text frames
+            // (resets and errors) are not part of the stream
+            if (typeof event.data === 'string') {
+                terminal.write(event.data);
+            } else {
+                received += event.data.byteLength;
+                terminal.write(new Uint8Array(event.data));
+            }
         };
         
         ws.onclose = function() {
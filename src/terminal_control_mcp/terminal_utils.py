@@ -5,17 +5,51 @@ Shared utilities for terminal window management and tmux operations
 """
 
 import asyncio
+import functools
 import logging
+import os
 import shutil
+from typing import Any
 
-from .settings import ServerConfig
+from .settings import get_config
 
 logger = logging.getLogger(__name__)
 
+# tmux sessions this process has attached a terminal window to
+_open_tmux_sessions: set[str] = set()
 
+
+# Arguments that make a terminal attach to a tmux session (name appended last)
+TMUX_ATTACH_ARGS = ("tmux", "attach-session", "-t")
+
+# Emulators whose argv does not follow the "<configured command> tmux ..." shape
+_SPECIAL_ATTACH_PREFIXES: dict[str, tuple[str, ...]] = {
+    # macOS Terminal
+    "open": ("open", "-a", "Terminal", "--args", *TMUX_ATTACH_ARGS),
+    # Kitty doesn't use -e
+    "kitty": ("kitty", *TMUX_ATTACH_ARGS),
+}
+
+
+@functools.cache
+def _attach_command_prefixes() -> dict[str, tuple[str, ...]]:
+    """Map each configured emulator executable to its full attach argv prefix"""
+    prefixes: dict[str, tuple[str, ...]] = {}
+    for emulator in get_config().terminal_emulators:
+        terminal_cmd = emulator["command"][0]
+        # First entry wins, matching the order used for detection
+        if terminal_cmd not in prefixes:
+            prefixes[terminal_cmd] = _SPECIAL_ATTACH_PREFIXES.get(
+                terminal_cmd, (*emulator["command"], *TMUX_ATTACH_ARGS)
+            )
+    return prefixes
+
+
+@functools.cache
 def detect_terminal_emulator() -> str | None:
     """Detect available terminal emulator using configuration"""
-    config = ServerConfig()
+    # Cached: the PATH scan costs several stat() calls per configured emulator
+    config = get_config()
     terminal_emulators = config.terminal_emulators
 
     for emulator in terminal_emulators:
@@ -28,46 +62,48 @@ def detect_terminal_emulator() -> str | None:
     return None
 
 
+@functools.cache
+def _executable_path(name: str) -> str | None:
+    """Resolve an executable to an absolute path once"""
+    return shutil.which(name)
+
+
+def _spawn_options(name: str) -> dict[str, Any]:
+    """Extra create_subprocess_exec arguments that enable the posix_spawn path"""
+    # Popen only uses posix_spawn for an absolute executable with close_fds
+    # off; that is safe because Python opens every fd non-inheritable
+    executable = _executable_path(name)
+    if executable is None:
+        return {}
+    return {"executable": executable, "close_fds": False}
+
+
+def _reset_detection() -> None:
+    """Forget the cached emulator detection and configuration"""
+    detect_terminal_emulator.cache_clear()
+    _attach_command_prefixes.cache_clear()
+    _executable_path.cache_clear()
+
+
 def _build_terminal_command(terminal_cmd: str, tmux_session_name: str) -> list[str]:
     """Build the appropriate command for different terminal emulators using configuration"""
-    config = ServerConfig()
-    # Find the matching emulator configuration
-    for emulator in config.terminal_emulators:
-        if emulator["command"][0] == terminal_cmd:
-            # Get the base command from configuration
-            base_command: list[str] = list(emulator["command"])
-
-            # Handle special cases for different terminal types
-            if terminal_cmd == "open":  # macOS Terminal
-                return [
-                    "open",
-                    "-a",
-                    "Terminal",
-                    "--args",
-                    "tmux",
-                    "attach-session",
-                    "-t",
-                    tmux_session_name,
-                ]
-            elif terminal_cmd == "kitty":  # Kitty doesn't use -e
-                return ["kitty", "tmux", "attach-session", "-t", tmux_session_name]
-            else:
-                # Most terminals use the pattern: terminal [args] tmux attach-session -t session
-                return base_command + [
-                    "tmux",
-                    "attach-session",
-                    "-t",
-                    tmux_session_name,
-                ]
-
-    # Fallback if not found in configuration
-    return [terminal_cmd, "-e", "tmux", "attach-session", "-t", tmux_session_name]
+    prefix = _attach_command_prefixes().get(terminal_cmd)
+    if prefix is None:
+        # Fallback if not found in configuration
+        prefix = (terminal_cmd, "-e", *TMUX_ATTACH_ARGS)
+    return [*prefix, tmux_session_name]
+
+
+def invalidate_env_cache() -> None:
+    """Rebuild the terminal environment from os.environ on next use"""
+    _prepare_environment.cache_clear()
 
 
+@functools.cache
 def _prepare_environment() -> dict[str, str]:
     """Prepare environment variables for terminal process"""
-    import os
-
+    # Cached: the server never edits os.environ after startup, and the
+    # subprocess only reads the mapping, so one copy serves every window
     env = os.environ.copy()
     env["DISPLAY"] = env.get("DISPLAY", ":0")
 
@@ -117,7 +153,7 @@ async def _check_process_result(
 ) -> bool:
     """Check if the terminal process started successfully"""
     try:
-        config = ServerConfig()
+        config = get_config()
         await asyncio.wait_for(
             process.wait(), timeout=config.terminal_process_check_timeout
         )
@@ -125,13 +161,8 @@ async def _check_process_result(
             logger.info(f"Terminal window opened successfully for session {session_id}")
             return True
         else:
-            stderr = (
-                await process.stderr.read()
-                if process.stderr
-                else b"No stderr available"
-            )
             logger.warning(
-                f"Terminal window failed with return code {process.returncode}: {stderr.decode()}"
+                f"Terminal window failed with return code {process.returncode}"
             )
             return False
     except TimeoutError:
@@ -154,14 +185,20 @@ async def open_terminal_window(session_id: str) -> bool:
         cmd = _build_terminal_command(terminal_cmd, tmux_session_name)
         env = _prepare_environment()
 
+        # No stderr pipe: the terminal outlives this call, and a pipe would keep
+        # a reader transport open for its whole lifetime
         process = await asyncio.create_subprocess_exec(
             *cmd,
             stdout=asyncio.subprocess.DEVNULL,
-            stderr=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
             env=env,
+            **_spawn_options(cmd[0]),
         )
 
-        return await _check_process_result(process, session_id, cmd)
+        opened = await _check_process_result(process, session_id, cmd)
+        if opened:
+            _open_tmux_sessions.add(tmux_session_name)
+        return opened
 
     except Exception as e:
         logger.warning(f"Failed to open terminal window for session {session_id}: {e}")
@@ -171,35 +208,59 @@ async def open_terminal_window(session_id: str) -> bool:
         return False
 
 
+async def _diagnose_tmux_failure(cmd: list[str]) -> str:
+    """Re-run a failed tmux command with stderr captured to explain the failure"""
+    process = await asyncio.create_subprocess_exec(
+        *cmd, stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.PIPE
+    )
+    _, stderr = await process.communicate()
+    return stderr.decode(errors="replace").strip()
+
+
 async def close_terminal_window(session_id: str) -> bool:
     """Close terminal windows that are attached to the tmux session"""
-    try:
-        # Build the tmux session name (sessions are prefixed with 'mcp_')
-        tmux_session_name = f"mcp_{session_id}"
+    # Build the tmux session name (sessions are prefixed with 'mcp_')
+    tmux_session_name = f"mcp_{session_id}"
+
+    # No window was opened for this session, so there is nothing to close;
+    # the tmux session itself is killed when the session terminates
+    if tmux_session_name not in _open_tmux_sessions:
+        return True
+    _open_tmux_sessions.discard(tmux_session_name)
+
+    return await _kill_tmux_session(session_id, tmux_session_name)
 
+
+async def _kill_tmux_session(session_id: str, tmux_session_name: str) -> bool:
+    """Kill a tmux session, which closes the terminals attached to it"""
+    try:
         # Use tmux to kill the session, which will close attached terminals
         cmd = ["tmux", "kill-session", "-t", tmux_session_name]
 
+        # stderr is only wanted on failure, so skip the pipe on the common path
         process = await asyncio.create_subprocess_exec(
-            *cmd, stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.PIPE
+            *cmd,
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.DEVNULL,
+            **_spawn_options(cmd[0]),
         )
 
         # Wait for the command to complete
-        config = ServerConfig()
+        config = get_config()
         await asyncio.wait_for(process.wait(), timeout=config.terminal_close_timeout)
 
         if process.returncode == 0:
             logger.info(f"Terminal window closed successfully for session {session_id}")
             return True
         else:
-            stderr = (
-                await process.stderr.read()
-                if process.stderr
-                else b"No stderr available"
-            )
             logger.warning(
-                f"Failed to close terminal window for session {session_id}: {stderr.decode()}"
+                f"Failed to close terminal window for session {session_id}: "
+                f"tmux exited with code {process.returncode}"
             )
+            if logger.isEnabledFor(logging.DEBUG):
+                # kill-session is idempotent, so a second run only adds the reason
+                reason = await _diagnose_tmux_failure(cmd)
+                logger.debug(f"tmux kill-session for {session_id} failed: {reason}")
             return False
 
     except TimeoutError:
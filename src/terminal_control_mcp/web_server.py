@@ -5,26 +5,144 @@ Provides HTTP endpoints for viewing and interacting with terminal sessions
 """
 
 import asyncio
+import contextlib
+import functools
+import gzip
+import hashlib
 import json
 import logging
+import os
+import socket
+import tempfile
+import time
 from asyncio import Task
 from pathlib import Path
-from typing import Optional
+from typing import BinaryIO, Optional
 
 import uvicorn
 from fastapi import FastAPI, HTTPException, Request, WebSocket, WebSocketDisconnect
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, Response
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
+from jinja2 import Template
 
 from .interactive_session import InteractiveSession
-from .session_manager import SessionManager
-from .settings import ServerConfig
+from .session_manager import SessionManager, SessionMetadata
+from .settings import get_config
 
 logger = logging.getLogger(__name__)
 
 # Web server configuration moved to config.py
 
+# Idle output polls back off geometrically up to this interval (seconds)
+IDLE_POLL_BACKOFF = 2.0
+MAX_IDLE_POLL_INTERVAL = 1.0
+# History replay and live stream output go out in frames of at most this size
+HISTORY_CHUNK_SIZE = 64 * 1024
+# Overview clients share one serialized session list for this long (seconds)
+OVERVIEW_MESSAGE_TTL = 1.0
+# Overview clients that take longer than this to accept a broadcast are dropped
+OVERVIEW_SEND_TIMEOUT = 1.0
+# Output chunks a viewer may fall behind before it is told to reconnect and
+# resume from the last byte it received
+VIEWER_QUEUE_SIZE = 256
+# Largest websocket message accepted from a browser (keystrokes and pastes)
+WS_MAX_MESSAGE_SIZE = 1024 * 1024
+# Full terminal reset (RIS), sent as text so it is not counted as stream bytes
+TERMINAL_RESET = "\x1bc"
+
+
+@functools.cache
+def _detect_local_ip() -> str:
+    """Find the address of the interface used for outbound traffic"""
+    # connect() on a UDP socket only picks a route; no packet is sent
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
+        s.connect(("8.8.8.8", 80))
+        return str(s.getsockname()[0])
+
+
+def get_local_ip() -> str:
+    """Return the local IP address for URLs, resolved once per process"""
+    try:
+        return _detect_local_ip()
+    except Exception:
+        # Failures are not cached, so a later call can still succeed
+        return "localhost"
+
+
+def reset_local_ip_cache() -> None:
+    """Forget the detected local IP, e.g. after a network change"""
+    _detect_local_ip.cache_clear()
+
+
+def _etag(body: bytes) -> str:
+    """Strong ETag for a rendered page"""
+    digest = hashlib.blake2b(body, digest_size=8).hexdigest()
+    return f'"{digest}"'
+
+
+class OutputPump:
+    """Output reader state for one session, fanned out to every viewer"""
+
+    __slots__ = ("task", "subscribers", "position", "last_content", "closed")
+
+    def __init__(self) -> None:
+        self.task: Task[None] | None = None
+        self.subscribers: set[asyncio.Queue[bytes | None]] = set()
+        # Stream bytes published so far; new viewers replay history up to here
+        self.position = 0
+        # Last direct capture, used instead of history in fallback mode
+        self.last_content = ""
+        # Set once the pump has stopped; later viewers are told straight away
+        self.closed = False
+
+    def subscribe(self) -> tuple[asyncio.Queue[bytes | None], int]:
+        """Add a viewer queue, returning it with the history position to replay"""
+        queue: asyncio.Queue[bytes | None] = asyncio.Queue(maxsize=VIEWER_QUEUE_SIZE)
+        if self.last_content:
+            # Fallback mode has no history file; start from the last capture
+            queue.put_nowait(self.last_content.encode("utf-8"))
+        if self.closed:
+            queue.put_nowait(None)
+        else:
+            self.subscribers.add(queue)
+        return queue, self.position
+
+    def publish(self, data: bytes) -> None:
+        """Queue output for every subscribed viewer"""
+        for queue in list(self.subscribers):
+            try:
+                queue.put_nowait(data)
+            except asyncio.QueueFull:
+                # Dropping chunks would split escape sequences, so a lagging
+                # viewer is closed and reconnects from the last byte it got
+                self.subscribers.discard(queue)
+                while not queue.empty():
+                    queue.get_nowait()
+                queue.put_nowait(None)
+
+    def close(self) -> None:
+        """Tell every viewer that no more output is coming"""
+        self.closed = True
+        for queue in self.subscribers:
+            if queue.full():
+                # Make room for the sentinel at the cost of the oldest chunk
+                queue.get_nowait()
+            queue.put_nowait(None)
+        self.subscribers.clear()
+
+
+class WebSession:
+    """Web-side state for one session, kept while any viewer is connected"""
+
+    __slots__ = ("pump", "input_lock", "viewers")
+
+    def __init__(self) -> None:
+        self.pump = OutputPump()
+        # Held around each send-keys so concurrent senders keep their order
+        self.input_lock = asyncio.Lock()
+        self.viewers = 0
+
 
 class WebServer:
     """FastAPI-based web server for terminal session access"""
@@ -39,18 +157,19 @@ class WebServer:
         self.host = "0.0.0.0"
 
         self.app = FastAPI(title="Terminal Control Web Interface")
-        # Track active xterm.js terminals
-        self.xterm_terminals: dict[str, dict] = {}  # session_id -> {websocket, session}
-        # Terminal buffer tracking for MCP tool access
-        self.terminal_buffers: dict[str, str] = (
-            {}
-        )  # session_id -> current_screen_content
-        # Input queues for MCP tools
-        self.input_queues: dict[str, asyncio.Queue] = {}  # session_id -> input_queue
+        # Sessions open in at least one xterm.js terminal
+        self.web_sessions: dict[str, WebSession] = {}  # session_id -> state
         # Overview WebSocket connections for auto-refresh
         self.overview_websockets: list[WebSocket] = []
+        self._overview_message: str | None = None
+        self._overview_message_time = 0.0
         # Templates
         self.templates: Jinja2Templates | None = None
+        # Fetched once so rendering skips the loader's per-request mtime check
+        self._index_template: Template | None = None
+        self._session_template: Template | None = None
+        # Last rendered index page as (sessions, encoded html, gzipped html, etag)
+        self._index_page: tuple[list[dict], bytes, bytes, str] | None = None
 
         # Setup templates and static files
         self._setup_templates_and_static()
@@ -64,6 +183,8 @@ class WebServer:
         except Exception as e:
             logger.error(f"Error setting up templates and static files: {e}")
             self.templates = None
+            self._index_template = None
+            self._session_template = None
 
     def _setup_templates(self) -> None:
         """Setup Jinja2 templates"""
@@ -74,7 +195,7 @@ class WebServer:
             template_path = resources.files("terminal_control_mcp") / "templates"
             if template_path.is_dir():
                 logger.info(f"Using package templates directory at: {template_path}")
-                self.templates = Jinja2Templates(directory=str(template_path))
+                self._load_templates(str(template_path))
                 logger.info("Package templates successfully loaded")
                 return
         except (ImportError, FileNotFoundError):
@@ -87,13 +208,19 @@ class WebServer:
             logger.info(
                 f"Falling back to source templates directory at: {templates_dir}"
             )
-            self.templates = Jinja2Templates(directory=str(templates_dir))
+            self._load_templates(str(templates_dir))
             logger.info("Source templates successfully loaded")
         else:
             self.templates = None
             logger.error(f"Templates directory not found at {templates_dir}")
             raise RuntimeError("Templates not found in package or source directory")
 
+    def _load_templates(self, directory: str) -> None:
+        """Create the template environment and fetch the page templates"""
+        self.templates = Jinja2Templates(directory=directory)
+        self._index_template = self.templates.get_template("index.html")
+        self._session_template = self.templates.get_template("session.html")
+
     def _setup_static_files(self) -> None:
         """Setup static file serving"""
         from importlib import resources
@@ -129,21 +256,55 @@ class WebServer:
         self.app.websocket("/overview")(self._overview_websocket_route)
         self.app.delete("/session/{session_id}")(self._destroy_session_route)
 
-    async def _index_route(self, request: Request) -> HTMLResponse:
+    async def _index_route(self, request: Request) -> Response:
         """Main page with list of sessions"""
         sessions = await self.session_manager.list_sessions()
-        session_data = [
-            {
-                "session_id": session.session_id,
-                "command": session.command,
-                "state": session.state.value,
-                "created_at": session.created_at,
-                "url": f"/session/{session.session_id}",
-            }
-            for session in sessions
-        ]
-        html_content = self._render_index_template(session_data)
-        return HTMLResponse(content=html_content)
+        session_data = [self._serialize_session(session) for session in sessions]
+        # The page only depends on the session list, so reuse the last render
+        if self._index_page is None or self._index_page[0] != session_data:
+            body = self._render_index_template(session_data).encode()
+            # Compressed once per render instead of once per request
+            gzipped = gzip.compress(body)
+            self._index_page = (session_data, body, gzipped, _etag(body))
+        _, body, gzipped, etag = self._index_page
+        return self._html_response(request, body, etag, gzipped)
+
+    def _html_response(
+        self,
+        request: Request,
+        body: bytes,
+        etag: str,
+        gzipped: bytes | None = None,
+    ) -> Response:
+        """Serve a page, or 304 if the browser already has this version"""
+        use_gzip = gzipped is not None and "gzip" in request.headers.get(
+            "accept-encoding", ""
+        )
+        if use_gzip:
+            # Each encoding is its own representation, so it needs its own ETag
+            etag = f'{etag[:-1]}-gzip"'
+
+        # no-cache still lets the browser store the page, but it must revalidate
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if gzipped is not None:
+            headers["Vary"] = "Accept-Encoding"
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers=headers)
+
+        if use_gzip and gzipped is not None:
+            headers["Content-Encoding"] = "gzip"
+            body = gzipped
+        return HTMLResponse(content=body, headers=headers)
+
+    def _serialize_session(self, session: SessionMetadata) -> dict:
+        """Describe a session for the index page and overview clients"""
+        return {
+            "session_id": session.session_id,
+            "command": session.command,
+            "state": session.state.value,
+            "created_at": session.created_at,
+            "url": f"/session/{session.session_id}",
+        }
 
     async def _get_session_data(self, session_id: str) -> dict:
         """Get session data for rendering"""
@@ -151,32 +312,25 @@ class WebServer:
         if not session:
             raise HTTPException(status_code=404, detail="Session not found")
 
-        sessions = await self.session_manager.list_sessions()
-        session_metadata = next(
-            (s for s in sessions if s.session_id == session_id), None
-        )
+        session_metadata = await self.session_manager.get_session_metadata(session_id)
         if not session_metadata:
             raise HTTPException(status_code=404, detail="Session metadata not found")
 
-        try:
-            screen_content = await session.get_current_screen_content()
-        except Exception as e:
-            logger.warning(f"Failed to get screen content: {e}")
-            screen_content = f"Error getting screen content: {e}"
-
+        # The page draws the screen from the PTY websocket's history replay,
+        # so no tmux capture is needed here
         return {
             "session_id": session_id,
             "command": session_metadata.command,
             "state": session_metadata.state.value,
-            "screen_content": screen_content,
             "process_running": session.is_process_alive(),
         }
 
-    async def _session_route(self, request: Request, session_id: str) -> HTMLResponse:
+    async def _session_route(self, request: Request, session_id: str) -> Response:
         """Session interface page"""
         session_data = await self._get_session_data(session_id)
-        html_content = self._render_session_template(session_data)
-        return HTMLResponse(content=html_content)
+        # Encoded once and shared by the ETag and the response body
+        body = self._render_session_template(session_data).encode()
+        return self._html_response(request, body, _etag(body))
 
     async def _pty_websocket_route(self, websocket: WebSocket, session_id: str) -> None:
         """WebSocket endpoint for xterm.js PTY connection using tmux"""
@@ -186,17 +340,26 @@ class WebServer:
         if not session:
             return
 
-        self._register_terminal_connection(session_id, websocket, session)
-        tasks = await self._setup_websocket_tasks(session_id, session, websocket)
+        web_session = self._attach_viewer(session_id, session)
+        relay_task: Task[None] | None = None
 
         try:
-            await self._handle_websocket_messages(session, websocket)
+            relay_task = self._start_output_relay(
+                session_id,
+                session,
+                websocket,
+                web_session.pump,
+                self._resume_offset(websocket),
+            )
+            await self._handle_websocket_messages(session, web_session, websocket)
         except WebSocketDisconnect:
             logger.debug(f"PTY WebSocket disconnected for session {session_id}")
         except Exception as e:
             logger.error(f"PTY WebSocket error for session {session_id}: {e}")
         finally:
-            await self._cleanup_websocket_connection(session_id, tasks, websocket)
+            await self._cleanup_websocket_connection(
+                session_id, web_session, relay_task, websocket
+            )
 
     async def _validate_session_for_websocket(
         self, websocket: WebSocket, session_id: str
@@ -209,78 +372,131 @@ class WebServer:
             return None
         return session
 
-    def _register_terminal_connection(
-        self, session_id: str, websocket: WebSocket, session: "InteractiveSession"
-    ) -> None:
-        """Register the terminal connection and initialize input queue"""
-        self.xterm_terminals[session_id] = {
-            "websocket": websocket,
-            "session": session,
-            "last_update": asyncio.get_event_loop().time(),
-        }
+    def _attach_viewer(
+        self, session_id: str, session: InteractiveSession
+    ) -> WebSession:
+        """Count a new viewer, starting the session's web tasks for the first one"""
+        web_session = self.web_sessions.get(session_id)
+        if web_session is None:
+            web_session = self.web_sessions[session_id] = WebSession()
+            # Existing output is history, replayed to each viewer in chunks;
+            # the pump only publishes what is written after this point
+            web_session.pump.position = self._stream_size(session)
+            web_session.pump.task = asyncio.create_task(
+                self._run_output_pump(session_id, session, web_session.pump)
+            )
+        web_session.viewers += 1
+        return web_session
 
-        if session_id not in self.input_queues:
-            self.input_queues[session_id] = asyncio.Queue()
+    def _stream_size(self, session: InteractiveSession) -> int:
+        """Current length of the session's stream file, 0 if it does not exist"""
+        try:
+            return session.output_stream_file.stat().st_size
+        except OSError:
+            return 0
+
+    def _detach_viewer(self, session_id: str, web_session: WebSession) -> None:
+        """Forget a viewer, stopping the session's web tasks after the last one"""
+        web_session.viewers -= 1
+        if web_session.viewers > 0:
+            return
 
-    async def _setup_websocket_tasks(
-        self, session_id: str, session: "InteractiveSession", websocket: WebSocket
-    ) -> dict[str, Task[None] | None]:
-        """Set up background tasks for WebSocket handling"""
-        # Initialize buffer for MCP tools
-        initial_content = await session.get_raw_terminal_output()
-        self.terminal_buffers[session_id] = initial_content
+        if self.web_sessions.get(session_id) is web_session:
+            del self.web_sessions[session_id]
+        if web_session.pump.task is not None:
+            web_session.pump.task.cancel()
 
+    def _resume_offset(self, websocket: WebSocket) -> int:
+        """Stream offset a reconnecting viewer has already received, else 0"""
+        try:
+            return max(int(websocket.query_params.get("offset", "0")), 0)
+        except ValueError:
+            return 0
+
+    def _start_output_relay(
+        self,
+        session_id: str,
+        session: InteractiveSession,
+        websocket: WebSocket,
+        pump: OutputPump,
+        offset: int,
+    ) -> Task[None]:
+        """Start relaying the session's output to this websocket"""
         # No manual content restoration needed - tmux pipe-pane stream will naturally
         # provide all session history through incremental polling
         logger.debug(
             f"WebSocket established for session {session_id}, starting incremental stream"
         )
-
-        # Start background tasks
-        mcp_input_task = asyncio.create_task(
-            self._handle_mcp_input(session_id, session)
-        )
-        output_poll_task = asyncio.create_task(
-            self._poll_tmux_output(session_id, session, websocket)
+        return asyncio.create_task(
+            self._poll_tmux_output(session_id, session, websocket, pump, offset)
         )
 
-        return {"mcp_input_task": mcp_input_task, "output_poll_task": output_poll_task}
-
     async def _handle_websocket_messages(
-        self, session: "InteractiveSession", websocket: WebSocket
+        self,
+        session: InteractiveSession,
+        web_session: WebSession,
+        websocket: WebSocket,
     ) -> None:
         """Handle incoming WebSocket messages"""
-        while True:
-            try:
-                message = await asyncio.wait_for(websocket.receive_text(), timeout=1.0)
+        pending: asyncio.Queue[str] = asyncio.Queue()
+        writer = asyncio.create_task(
+            self._write_browser_input(session, web_session, websocket, pending)
+        )
+
+        try:
+            # Blocks until a message arrives and ends on disconnect; uvicorn's
+            # websocket ping/pong keeps idle connections alive
+            async for message in websocket.iter_text():
                 data = json.loads(message)
 
                 if data["type"] == "input":
-                    await session.send_input(data["data"])
+                    pending.put_nowait(data["data"])
                 elif data["type"] == "resize":
                     # Ignore resize events - tmux stays at fixed size for clean MCP output
                     pass
+        finally:
+            writer.cancel()
 
-            except TimeoutError:
-                # Keep connection alive
-                continue
+    async def _write_browser_input(
+        self,
+        session: InteractiveSession,
+        web_session: WebSession,
+        websocket: WebSocket,
+        pending: asyncio.Queue[str],
+    ) -> None:
+        """Send browser keystrokes to tmux, merging any that queue up meanwhile"""
+        try:
+            while True:
+                parts = [await pending.get()]
+                # Keystrokes that arrived during the last send-keys go in one call
+                while not pending.empty():
+                    parts.append(pending.get_nowait())
+                # xterm.js sends raw characters, never tmux key names like "Enter"
+                async with web_session.input_lock:
+                    await session.send_input("".join(parts), literal=True)
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            logger.error(f"Failed to forward browser input: {e}")
+            await websocket.close()
 
     async def _cleanup_websocket_connection(
         self,
         session_id: str,
-        tasks: dict[str, Task[None] | None],
+        web_session: WebSession,
+        relay_task: Task[None] | None,
         websocket: WebSocket,
     ) -> None:
         """Clean up WebSocket connection and associated resources"""
-        # Cancel background tasks
-        for task in tasks.values():
-            if task is not None:
-                task.cancel()
-
-        # Clean up tracking dictionaries
-        self.xterm_terminals.pop(session_id, None)
-        self.terminal_buffers.pop(session_id, None)
-        self.input_queues.pop(session_id, None)
+        try:
+            if relay_task is not None:
+                relay_task.cancel()
+                # Let the relay drop its subscription before the viewer goes
+                await asyncio.gather(relay_task, return_exceptions=True)
+        finally:
+            # Runs even if this cleanup is itself cancelled, so the viewer
+            # count cannot leak and keep the session's pump alive
+            self._detach_viewer(session_id, web_session)
 
         try:
             await websocket.close()
@@ -288,203 +504,241 @@ class WebServer:
             pass
 
     async def _poll_tmux_output(
-        self, session_id: str, session: InteractiveSession, websocket: WebSocket
+        self,
+        session_id: str,
+        session: InteractiveSession,
+        websocket: WebSocket,
+        pump: OutputPump,
+        offset: int,
     ) -> None:
-        """Poll tmux session for new stream output and send incremental data to websocket"""
-        websocket_stream_position = 0
-        use_direct_capture = False
+        """Relay the session's shared output pump to one websocket"""
+        queue, history_end = pump.subscribe()
 
         try:
-            # Send historical content first
-            websocket_stream_position = await self._send_historical_content(
-                session, websocket, session_id
+            # A reconnecting viewer keeps its screen and only needs the bytes
+            # it missed; anyone else is reset and gets the whole history
+            start = offset if 0 < offset <= history_end else 0
+            if not start:
+                await websocket.send_text(TERMINAL_RESET)
+            # Everything before history_end was published before this viewer
+            # subscribed; everything after it arrives through the queue
+            await self._send_historical_content(
+                session, websocket, session_id, start, history_end
             )
-
-            # Check if pipe-pane is working by monitoring the stream file
-            await asyncio.sleep(0.5)  # Give pipe-pane time to start
-            if (
-                not session.output_stream_file.exists()
-                or session.output_stream_file.stat().st_size == 0
-            ):
-                logger.info(
-                    f"Stream file not working for session {session_id}, using direct tmux capture"
-                )
-                use_direct_capture = True
-
-            if use_direct_capture:
-                await self._poll_direct_tmux_capture(session_id, session, websocket)
-            else:
-                # Use standard pipe-pane streaming
-                await self._poll_incremental_updates(
-                    session_id, session, websocket, websocket_stream_position
-                )
+            await self._relay_queue(session_id, queue, websocket)
         except asyncio.CancelledError:
             pass
-
-    async def _send_historical_content(
-        self, session: InteractiveSession, websocket: WebSocket, session_id: str
-    ) -> int:
-        """Send existing historical content and return stream position"""
-        websocket_stream_position = 0
-
-        if not session.output_stream_file.exists():
-            return websocket_stream_position
-
-        try:
-            with open(session.output_stream_file, "rb") as f:
-                historical_data = f.read()
-                websocket_stream_position = f.tell()
-
-            if historical_data:
-                historical_content = historical_data.decode("utf-8", errors="replace")
-                await websocket.send_text(historical_content)
-                logger.debug(
-                    f"Restored {len(historical_content)} chars of history for session {session_id}"
-                )
         except Exception as e:
-            logger.debug(f"Error restoring historical content: {e}")
-
-        return websocket_stream_position
+            logger.debug(f"Error relaying output for session {session_id}: {e}")
+        finally:
+            pump.subscribers.discard(queue)
 
-    async def _poll_incremental_updates(
+    async def _relay_queue(
         self,
         session_id: str,
-        session: InteractiveSession,
+        queue: asyncio.Queue[bytes | None],
         websocket: WebSocket,
-        stream_position: int,
     ) -> None:
-        """Poll for and send incremental updates"""
-        websocket_stream_position = stream_position
-
+        """Send queued output until the pump stops or drops this viewer"""
         while True:
-            config = ServerConfig()
-            await asyncio.sleep(
-                config.terminal_polling_interval
-            )  # Poll for responsiveness
+            data = await queue.get()
+            if data is None:
+                logger.info(f"Closing viewer of session {session_id}")
+                await websocket.close()
+                return
+            await websocket.send_bytes(data)
 
-            try:
-                websocket_stream_position = await self._process_stream_update(
-                    session_id, session, websocket, websocket_stream_position
+    async def _run_output_pump(
+        self, session_id: str, session: InteractiveSession, pump: OutputPump
+    ) -> None:
+        """Read a session's output once and publish it to every viewer"""
+        try:
+            if await self._stream_file_ready(session):
+                await self._poll_incremental_updates(session_id, session, pump)
+            else:
+                logger.info(
+                    f"Stream file not working for session {session_id}, using direct tmux capture"
                 )
-                await self._check_session_termination(session_id, session)
-            except Exception as e:
-                logger.debug(f"Error polling tmux stream output: {e}")
+                await self._poll_direct_tmux_capture(session_id, session, pump)
+        except asyncio.CancelledError:
+            pass
+        finally:
+            # Relays wait on their queues, so they must hear that output ended
+            pump.close()
+
+    async def _stream_file_ready(self, session: InteractiveSession) -> bool:
+        """Check whether pipe-pane is writing the stream file"""
+
+        def has_output() -> bool:
+            try:
+                return session.output_stream_file.stat().st_size > 0
+            except OSError:
+                return False
 
-    async def _process_stream_update(
+        if has_output():
+            return True
+        await asyncio.sleep(0.5)  # Give pipe-pane time to start
+        return has_output()
+
+    async def _send_historical_content(
         self,
-        session_id: str,
         session: InteractiveSession,
         websocket: WebSocket,
-        stream_position: int,
-    ) -> int:
-        """Process a single stream update and return new position"""
-        if not session.output_stream_file.exists():
-            return stream_position
+        session_id: str,
+        start: int,
+        history_end: int,
+    ) -> None:
+        """Send the stream file from start up to history_end to a new viewer"""
+        sent = 0
+        length = history_end - start
 
-        with open(session.output_stream_file, "rb") as f:
-            f.seek(stream_position)
-            new_data = f.read()
-            new_stream_position = f.tell()
+        try:
+            # Raw chunks, so a long history is never decoded or held in memory
+            # as one string; the client reassembles split characters
+            with open(session.output_stream_file, "rb", buffering=0) as f:
+                f.seek(start)
+                while sent < length and (
+                    chunk := f.read(min(HISTORY_CHUNK_SIZE, length - sent))
+                ):
+                    await websocket.send_bytes(chunk)
+                    sent += len(chunk)
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            logger.debug(f"Error restoring historical content: {e}")
 
-        if new_data:
-            new_stream_data = new_data.decode("utf-8", errors="replace")
-            await websocket.send_text(new_stream_data)
+        if sent:
+            logger.debug(f"Restored {sent} bytes of history for session {session_id}")
 
-            # Update buffer for MCP tools
-            full_content = await session.get_raw_terminal_output()
-            self.terminal_buffers[session_id] = full_content
+    async def _poll_incremental_updates(
+        self, session_id: str, session: InteractiveSession, pump: OutputPump
+    ) -> None:
+        """Poll for and publish incremental updates"""
+        try:
+            # Held open for the life of the pump; each poll is then a single
+            # read() continuing from the previous one
+            stream = open(session.output_stream_file, "rb", buffering=0)
+        except FileNotFoundError:
+            logger.info(
+                f"Stream file missing for session {session_id}, using direct tmux capture"
+            )
+            await self._poll_direct_tmux_capture(session_id, session, pump)
+            return
 
-            # Update timestamp for MCP tools
-            if session_id in self.xterm_terminals:
-                self.xterm_terminals[session_id][
-                    "last_update"
-                ] = asyncio.get_event_loop().time()
+        with stream:
+            stream.seek(pump.position)
+            interval = get_config().terminal_polling_interval
 
-        return new_stream_position
+            while True:
+                woken = await self._wait_for_poll(session, interval)
+                received = False
+
+                try:
+                    received = self._process_stream_update(session_id, pump, stream)
+                    if await self._check_session_termination(session_id, session):
+                        return
+                except Exception as e:
+                    logger.debug(f"Error polling tmux stream output: {e}")
+
+                interval = self._next_poll_interval(interval, woken or received)
+
+    async def _wait_for_poll(
+        self, session: InteractiveSession, interval: float
+    ) -> bool:
+        """Sleep one poll interval, returning True if input woke the poller early"""
+        # Any input, from a browser or an MCP tool, sets the session's event;
+        # idle sessions therefore cost one timer per (backed-off) interval
+        try:
+            await asyncio.wait_for(session.input_event.wait(), timeout=interval)
+        except TimeoutError:
+            return False
+        session.input_event.clear()
+        return True
+
+    def _next_poll_interval(self, interval: float, active: bool) -> float:
+        """Reset the poll interval on activity, otherwise back off while idle"""
+        if active:
+            return get_config().terminal_polling_interval
+        return min(interval * IDLE_POLL_BACKOFF, MAX_IDLE_POLL_INTERVAL)
+
+    def _process_stream_update(
+        self, session_id: str, pump: OutputPump, stream: BinaryIO
+    ) -> bool:
+        """Publish any output appended to the stream, returning whether there was any"""
+        received = False
+        # Raw bytes in bounded frames; the client's decoder copes with
+        # characters split between frames
+        while new_data := stream.read(HISTORY_CHUNK_SIZE):
+            pump.position += len(new_data)
+            pump.publish(new_data)
+            received = True
+        return received
 
     async def _poll_direct_tmux_capture(
-        self, session_id: str, session: InteractiveSession, websocket: WebSocket
+        self, session_id: str, session: InteractiveSession, pump: OutputPump
     ) -> None:
         """Fallback polling using direct tmux capture for Android/Termux compatibility"""
-        last_content = ""
+        interval = get_config().terminal_polling_interval
 
         while True:
-            config = ServerConfig()
-            await asyncio.sleep(config.terminal_polling_interval)
+            woken = await self._wait_for_poll(session, interval)
+            changed = False
 
             try:
                 current_content = await session.get_raw_terminal_output()
-                await self._process_content_changes(
-                    session_id, websocket, current_content, last_content
-                )
-                last_content = current_content
-                await self._check_session_termination(session_id, session)
+                changed = current_content != pump.last_content
+                self._process_content_changes(session_id, pump, current_content)
+                if await self._check_session_termination(session_id, session):
+                    return
             except Exception as e:
                 logger.debug(f"Error in direct tmux capture polling: {e}")
 
-    async def _process_content_changes(
-        self, session_id: str, websocket: WebSocket, current_content: str, last_content: str
-    ) -> None:
-        """Process changes in terminal content and update buffers"""
-        if current_content != last_content:
-            await self._send_content_diff(websocket, current_content, last_content)
-            self._update_terminal_buffers(session_id, current_content)
-
-    async def _send_content_diff(
-        self, websocket: WebSocket, current_content: str, last_content: str
-    ) -> None:
-        """Send only new content changes to websocket"""
-        if last_content and current_content.startswith(last_content):
-            # Only new content was added at the end
-            new_content = current_content[len(last_content) :]
-            if new_content:
-                await websocket.send_text(new_content)
-        else:
-            # Content changed significantly, send all (handles screen clears, etc.)
-            await websocket.send_text(current_content)
-
-    def _update_terminal_buffers(self, session_id: str, content: str) -> None:
-        """Update terminal buffers and timestamps"""
-        self.terminal_buffers[session_id] = content
-        if session_id in self.xterm_terminals:
-            self.xterm_terminals[session_id]["last_update"] = asyncio.get_event_loop().time()
+            interval = self._next_poll_interval(interval, woken or changed)
 
-    async def _handle_mcp_input(
-        self, session_id: str, session: InteractiveSession
+    def _process_content_changes(
+        self, session_id: str, pump: OutputPump, current_content: str
     ) -> None:
-        """Background task to handle input from MCP tools"""
-        input_queue = self.input_queues[session_id]
-
-        try:
-            while True:
-                # Wait for input from MCP tools
-                input_data = await input_queue.get()
-
-                # Send to the tmux session - no complex output handling needed
-                await session.send_input(input_data)
+        """Publish changes in terminal content to every viewer"""
+        last_content = pump.last_content
+        if current_content == last_content:
+            return
 
-                # tmux output polling will handle sending updates to web interface
+        content_diff = self._content_diff(current_content, last_content)
+        if content_diff:
+            # Binary frames like the stream path, so xterm.js gets one format
+            pump.publish(content_diff.encode("utf-8"))
+        pump.last_content = current_content
 
-        except asyncio.CancelledError:
-            pass  # Task was cancelled, clean exit
-        except Exception as e:
-            logger.error(f"Error in MCP input handler for session {session_id}: {e}")
+    def _content_diff(self, current_content: str, last_content: str) -> str:
+        """Return only the new content changes to send to viewers"""
+        if last_content and current_content.startswith(last_content):
+            # Only new content was added at the end
+            return current_content[len(last_content) :]
+        # Content changed significantly, send all (handles screen clears, etc.)
+        return current_content
 
     async def mcp_send_input(self, session_id: str, input_data: str) -> bool:
         """Send input to terminal via xterm.js (for MCP tools)"""
-        if session_id not in self.input_queues:
+        web_session = self.web_sessions.get(session_id)
+        if web_session is None:
+            return False
+
+        session = await self.session_manager.get_session(session_id)
+        if session is None:
             return False
 
         try:
-            await self.input_queues[session_id].put(input_data)
+            # Viewers see the echo through the session's output pump
+            async with web_session.input_lock:
+                await session.send_input(input_data)
             return True
         except Exception as e:
-            logger.error(f"Failed to queue input for session {session_id}: {e}")
+            logger.error(f"Failed to send input to session {session_id}: {e}")
             return False
 
     def is_xterm_active(self, session_id: str) -> bool:
         """Check if xterm.js terminal is active for this session"""
-        return session_id in self.xterm_terminals
+        return session_id in self.web_sessions
 
     async def mcp_get_screen_content(self, session_id: str) -> str | None:
         """Get current screen content from tmux session (for MCP tools)"""
@@ -515,29 +769,34 @@ class WebServer:
         """Handle the overview WebSocket update loop"""
         while True:
             await asyncio.sleep(2.0)
-            session_data = await self._get_session_data_for_overview()
+            if websocket not in self.overview_websockets:
+                # Dropped by a broadcast for stalling
+                break
+            message = await self._get_overview_message()
 
             try:
-                message = json.dumps(
-                    {"type": "session_update", "sessions": session_data}
-                )
                 await websocket.send_text(message)
             except Exception:
                 break
 
+    async def _get_overview_message(self) -> str:
+        """Return the serialized session overview, rebuilt at most once per TTL"""
+        now = time.monotonic()
+        if (
+            self._overview_message is None
+            or now - self._overview_message_time >= OVERVIEW_MESSAGE_TTL
+        ):
+            session_data = await self._get_session_data_for_overview()
+            self._overview_message = json.dumps(
+                {"type": "session_update", "sessions": session_data}
+            )
+            self._overview_message_time = now
+        return self._overview_message
+
     async def _get_session_data_for_overview(self) -> list[dict]:
         """Get session data formatted for overview"""
         sessions = await self.session_manager.list_sessions()
-        return [
-            {
-                "session_id": session.session_id,
-                "command": session.command,
-                "state": session.state.value,
-                "created_at": session.created_at,
-                "url": f"/session/{session.session_id}",
-            }
-            for session in sessions
-        ]
+        return [self._serialize_session(session) for session in sessions]
 
     async def _cleanup_overview_websocket(self, websocket: WebSocket) -> None:
         """Clean up overview WebSocket connection"""
@@ -561,39 +820,45 @@ class WebServer:
 
     async def _broadcast_session_update(self) -> None:
         """Broadcast session updates to all overview WebSocket connections"""
+        # Sessions changed, so the cached overview is stale for everyone
+        self._overview_message = None
         if not self.overview_websockets:
             return
 
-        sessions = await self.session_manager.list_sessions()
-        session_data = [
-            {
-                "session_id": session.session_id,
-                "command": session.command,
-                "state": session.state.value,
-                "created_at": session.created_at,
-                "url": f"/session/{session.session_id}",
-            }
-            for session in sessions
-        ]
-
-        message = json.dumps({"type": "session_update", "sessions": session_data})
+        message = await self._get_overview_message()
+
+        # Send to all connected overview clients at once so a slow one
+        # does not hold up the rest, and give up on any that stall
+        clients = list(self.overview_websockets)
+        results = await asyncio.gather(
+            *(
+                asyncio.wait_for(ws.send_text(message), OVERVIEW_SEND_TIMEOUT)
+                for ws in clients
+            ),
+            return_exceptions=True,
+        )
 
-        # Send to all connected overview clients
-        disconnected = []
-        for ws in self.overview_websockets:
-            try:
-                await ws.send_text(message)
-            except Exception:
-                disconnected.append(ws)
+        # Close disconnected and stalled websockets: a send cut short by the
+        # timeout may have left a partial frame, so the connection is unusable
+        dropped = [
+            ws
+            for ws, result in zip(clients, results, strict=True)
+            if isinstance(result, Exception)
+        ]
+        for ws in dropped:
+            if ws in self.overview_websockets:
+                self.overview_websockets.remove(ws)
+        await asyncio.gather(*(self._close_overview_websocket(ws) for ws in dropped))
 
-        # Clean up disconnected websockets
-        for ws in disconnected:
-            self.overview_websockets.remove(ws)
+    async def _close_overview_websocket(self, websocket: WebSocket) -> None:
+        """Close a dropped overview client without waiting on it indefinitely"""
+        with contextlib.suppress(Exception):
+            await asyncio.wait_for(websocket.close(), OVERVIEW_SEND_TIMEOUT)
 
     async def _check_session_termination(
         self, session_id: str, session: InteractiveSession
-    ) -> None:
-        """Check if session process has terminated and auto-destroy if needed"""
+    ) -> bool:
+        """Auto-destroy the session once its process ends, returning True if so"""
         try:
             if not session.is_process_alive():
                 logger.info(
@@ -601,31 +866,29 @@ class WebServer:
                 )
                 await self.session_manager.destroy_session(session_id)
                 await self._broadcast_session_update()
+                return True
         except Exception as e:
             logger.debug(f"Error checking session termination: {e}")
+        return False
 
     def _render_index_template(self, sessions: list[dict]) -> str:
         """Render the index page template"""
-        if not self.templates:
+        if not self._index_template:
             raise RuntimeError(
                 "Templates directory not found - external templates are required"
             )
 
-        template_result = self.templates.get_template("index.html").render(
-            sessions=sessions
-        )
+        template_result = self._index_template.render(sessions=sessions)
         return str(template_result)
 
     def _render_session_template(self, session_data: dict) -> str:
         """Render the session interface template"""
-        if not self.templates:
+        if not self._session_template:
             raise RuntimeError(
                 "Templates directory not found - external templates are required"
             )
 
-        template_result = self.templates.get_template("session.html").render(
-            **session_data
-        )
+        template_result = self._session_template.render(**session_data)
         return str(template_result)
 
     async def start(self) -> None:
@@ -636,10 +899,43 @@ class WebServer:
             port=self.port,
             log_level="info",
             access_log=False,  # Reduce noise in logs
+            # http and ws stay on "auto", which picks httptools and websockets
+            # when the speedups extra is installed
+            ws_max_size=WS_MAX_MESSAGE_SIZE,
+            # permessage-deflate shrinks ANSI-heavy terminal output several
+            # times over; it can be switched off for mostly binary streams
+            ws_per_message_deflate=get_config().web_ws_compression,
         )
         server = uvicorn.Server(config)
         logger.info(f"Starting web server on http://{self.host}:{self.port}")
-        await server.serve()
+        if get_config().web_profile:
+            await self._serve_profiled(server)
+        else:
+            await server.serve()
+
+    async def _serve_profiled(self, server: uvicorn.Server) -> None:
+        """Serve under pyinstrument and write an HTML report when stopped"""
+        try:
+            from pyinstrument import Profiler
+        except ImportError:
+            logger.error("web.profile is set but pyinstrument is not installed")
+            await server.serve()
+            return
+
+        # Sample the whole event loop rather than single requests: the output
+        # pumps and websocket loops run outside any HTTP request
+        profiler = Profiler(async_mode="disabled")
+        profiler.start()
+        try:
+            await server.serve()
+        finally:
+            profiler.stop()
+            report = (
+                Path(tempfile.gettempdir())
+                / f"terminal-control-profile-{os.getpid()}.html"
+            )
+            report.write_text(profiler.output_html())
+            logger.info(f"Web server profile written to {report}")
 
     def get_session_url(self, session_id: str, external_host: str | None = None) -> str:
         """Get the URL for a specific session
@@ -653,14 +949,6 @@ class WebServer:
         display_host = external_host or self.host
         if display_host == "0.0.0.0":
             # Try to determine a reasonable default
-            import socket
-
-            try:
-                # Get the local IP address
-                with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as s:
-                    s.connect(("8.8.8.8", 80))
-                    display_host = s.getsockname()[0]
-            except Exception:
-                display_host = "localhost"
+            display_host = get_local_ip()
 
         return f"http://{display_host}:{self.port}/session/{session_id}"
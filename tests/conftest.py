@@ -3,20 +3,21 @@
 Centralized pytest configuration and fixtures for the MCP server test suite
 """
 
-import asyncio
 import logging
+import logging.handlers
 import os
+import queue
 import sys
-import tempfile
-from collections.abc import AsyncGenerator, Generator
+from collections.abc import Generator
 from pathlib import Path
 from types import SimpleNamespace
 
 import pytest
 
-# Add project root to Python path before any project imports
+# Add project root to Python path before any project imports, once
 PROJECT_ROOT = Path(__file__).parent.parent
-sys.path.insert(0, str(PROJECT_ROOT))
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
 
 # Project imports after path modification (ruff: disable E402)
 from src.terminal_control_mcp.security import SecurityManager  # noqa: E402
@@ -25,35 +26,20 @@ from src.terminal_control_mcp.session_manager import SessionManager  # noqa: E40
 # === Core Fixtures ===
 
 
-@pytest.fixture(scope="session")
-def event_loop() -> Generator[asyncio.AbstractEventLoop, None, None]:
-    """Create an instance of the default event loop for the test session."""
-    loop = asyncio.get_event_loop_policy().new_event_loop()
-    yield loop
-    loop.close()
-
-
 @pytest.fixture
-def security_manager() -> SecurityManager:
+def security_manager() -> Generator[SecurityManager, None, None]:
     """Create a SecurityManager instance for testing"""
-    return SecurityManager()
+    manager = SecurityManager()
+    yield manager
+    manager.close()
 
 
 @pytest.fixture
 def session_manager() -> SessionManager:
-    """Create a SessionManager instance for testing (sync version)"""
+    """Create a SessionManager instance for testing"""
     return SessionManager()
 
 
-@pytest.fixture
-async def async_session_manager() -> AsyncGenerator[SessionManager, None]:
-    """Create a SessionManager instance for testing (async version with cleanup)"""
-    manager = SessionManager()
-    yield manager
-    # Clean up the manager after the test
-    await manager.shutdown()
-
-
 @pytest.fixture
 def app_context(
     security_manager: SecurityManager, session_manager: SessionManager
@@ -66,18 +52,6 @@ def app_context(
     )
 
 
-@pytest.fixture
-async def async_app_context(
-    security_manager: SecurityManager, async_session_manager: SessionManager
-) -> SimpleNamespace:
-    """Create async application context with managers for integration tests"""
-    return SimpleNamespace(
-        security_manager=security_manager,
-        session_manager=async_session_manager,
-        web_server=None,  # Mock web server as None for tests
-    )
-
-
 @pytest.fixture
 def mock_context(app_context: SimpleNamespace) -> SimpleNamespace:
     """Create mock MCP context for tool call tests"""
@@ -86,76 +60,69 @@ def mock_context(app_context: SimpleNamespace) -> SimpleNamespace:
     )
 
 
-@pytest.fixture
-async def async_mock_context(async_app_context: SimpleNamespace) -> SimpleNamespace:
-    """Create async mock MCP context for tool call tests"""
-    return SimpleNamespace(
-        request_context=SimpleNamespace(lifespan_context=async_app_context)
-    )
-
-
 # === File System Fixtures ===
 
 
 @pytest.fixture
-def temp_dir() -> Generator[str, None, None]:
-    """Create a temporary directory for tests"""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        yield tmpdir
+def temp_dir(tmp_path: Path) -> str:
+    """Temporary directory for tests, backed by pytest's managed tmp_path"""
+    return str(tmp_path)
 
 
 @pytest.fixture
-def mock_audit_log_path(temp_dir: str) -> Generator[str, None, None]:
+def mock_audit_log_path(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> str:
     """Mock audit log path in environment"""
-    audit_path = os.path.join(temp_dir, "audit.log")
-    with pytest.MonkeyPatch().context() as m:
-        m.setenv("MCP_AUDIT_LOG_PATH", audit_path)
-        yield audit_path
+    audit_path = str(tmp_path / "audit.log")
+    monkeypatch.setenv("MCP_AUDIT_LOG_PATH", audit_path)
+    return audit_path
 
 
 # === Test Data Fixtures ===
+# Constant data is built once per run and returned as tuples, so no test can
+# mutate what the next one sees. The managers above stay per-test because
+# they carry rate limits, caches and sessions.
 
 
-@pytest.fixture
-def dangerous_commands() -> list[str]:
+@pytest.fixture(scope="session")
+def dangerous_commands() -> tuple[str, ...]:
     """Dangerous commands that should be blocked"""
-    return [
+    return (
         "rm -rf /",
         "sudo rm -rf /var",
         "dd if=/dev/zero of=/dev/sda",
         "mkfs.ext4 /dev/sda1",
         "chmod 777 /etc/passwd",
         "systemctl stop ssh",
-    ]
+    )
 
 
-@pytest.fixture
-def safe_commands() -> list[str]:
+@pytest.fixture(scope="session")
+def safe_commands() -> tuple[str, ...]:
     """Safe commands that should be allowed"""
-    return ["echo 'hello world'", "ls -la", "python3 --version", "pwd", "date"]
+    return ("echo 'hello world'", "ls -la", "python3 --version", "pwd", "date")
 
 
-@pytest.fixture
-def malicious_inputs() -> list[str]:
+@pytest.fixture(scope="session")
+def malicious_inputs() -> tuple[str, ...]:
     """Malicious input patterns for injection testing"""
-    return [
+    return (
         "test; rm something",  # shell injection with rm
         "test`cat /etc/passwd`",  # backtick injection
         "test$(malicious_command)",  # command substitution
         "test\x00malicious",  # null byte
-    ]
+    )
 
 
-@pytest.fixture
-def safe_inputs() -> list[str]:
+@pytest.fixture(scope="session")
+def safe_inputs() -> tuple[str, ...]:
     """Safe input patterns"""
-    return ["hello world", "user@example.com", "normal text with 123"]
+    return ("hello world", "user@example.com", "normal text with 123")
 
 
-@pytest.fixture
-def blocked_paths() -> list[str]:
+@pytest.fixture(scope="session")
+def blocked_paths() -> tuple[str, ...]:
     """Paths that should be blocked"""
-    return ["/etc/passwd", "/etc/shadow", "/boot/grub.cfg", "../../../etc/passwd"]
+    return ("/etc/passwd", "/etc/shadow", "/boot/grub.cfg", "../../../etc/passwd")
 
 
 @pytest.fixture
@@ -164,7 +131,7 @@ def safe_paths(temp_dir: str) -> list[str]:
     return ["/tmp/test.txt", f"{temp_dir}/safe_file.txt", "/var/tmp/upload.log"]
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_environment_vars() -> dict[str, dict[str, str]]:
     """Sample environment variables for testing"""
     return {
@@ -177,33 +144,46 @@ def sample_environment_vars() -> dict[str, dict[str, str]]:
 
 
 @pytest.fixture(scope="session", autouse=True)
-def configure_logging() -> None:
-    """Configure logging for tests"""
+def configure_logging() -> Generator[None, None, None]:
+    """Write test warnings to a log file from a background listener thread"""
     log_dir = PROJECT_ROOT / "logs"
     log_dir.mkdir(exist_ok=True)
-
-    logging.basicConfig(
-        level=logging.WARNING,  # Reduce noise during tests
-        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-        handlers=[
-            logging.FileHandler(log_dir / "test.log"),
-        ],
+    # Under pytest-xdist each worker process writes its own log file
+    worker = os.environ.get("PYTEST_XDIST_WORKER")
+    log_file = log_dir / (f"test-{worker}.log" if worker else "test.log")
+
+    # The root logger already has pytest's capture handlers by now, so
+    # basicConfig would be a no-op; attach the handler explicitly. Records
+    # go through a queue so logging calls never wait on the file.
+    file_handler = logging.FileHandler(log_file, delay=True)
+    file_handler.setFormatter(
+        logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s")
     )
+    log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.setLevel(logging.WARNING)  # Reduce noise during tests
+    listener = logging.handlers.QueueListener(log_queue, file_handler)
+
+    root = logging.getLogger()
+    root.addHandler(queue_handler)
+    listener.start()
+    yield
+    root.removeHandler(queue_handler)
+    listener.stop()
+    file_handler.close()
 
 
 @pytest.fixture(autouse=True)
 def clean_environment() -> Generator[None, None, None]:
     """Clean environment variables before each test"""
-    original_env = os.environ.copy()
-
-    # Remove test-related environment variables
-    test_vars = [key for key in os.environ if key.startswith("MCP_")]
-    for var in test_vars:
-        if var in os.environ:
-            del os.environ[var]
+    # Only MCP_* variables are cleared, so only they need saving and restoring
+    saved = {key: value for key, value in os.environ.items() if key.startswith("MCP_")}
+    for var in saved:
+        del os.environ[var]
 
     yield
 
-    # Restore original environment
-    os.environ.clear()
-    os.environ.update(original_env)
+    # Drop MCP_* variables the test left behind, then put the originals back
+    for var in [key for key in os.environ if key.startswith("MCP_")]:
+        del os.environ[var]
+    os.environ.update(saved)
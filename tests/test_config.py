@@ -1,6 +1,9 @@
 """Tests for configuration system with TOML support"""
 
+from pathlib import Path
+
 import pytest
+from pydantic import ValidationError
 
 from src.terminal_control_mcp.settings import (
     LoggingSettings,
@@ -11,6 +14,8 @@ from src.terminal_control_mcp.settings import (
     TerminalEmulator,
     TerminalSettings,
     WebSettings,
+    get_config,
+    reload_config,
 )
 
 # Test constants to avoid magic values
@@ -43,6 +48,7 @@ class TestPydanticConfiguration:
         assert config.web_host == "0.0.0.0"
         assert config.web_port == DEFAULT_WEB_PORT
         assert config.external_web_host is None
+        assert config.web_profile is False
         assert config.security_level == SecurityLevel.HIGH
         assert config.max_calls_per_minute == DEFAULT_MAX_CALLS
         assert config.max_sessions == DEFAULT_MAX_SESSIONS
@@ -106,7 +112,8 @@ class TestPydanticConfiguration:
         # Terminal emulators
         assert len(terminal_settings.emulators) == TEST_EMULATOR_COUNT
         assert terminal_settings.emulators[0].name == "gnome-terminal"
-        assert terminal_settings.emulators[0].command == ["gnome-terminal", "--"]
+        # TOML lists are stored as tuples so the frozen config is fully immutable
+        assert terminal_settings.emulators[0].command == ("gnome-terminal", "--")
 
     def test_security_level_parsing(self) -> None:
         """Test security level parsing from enum values"""
@@ -141,18 +148,52 @@ class TestPydanticConfiguration:
         assert config.terminal_width == config.terminal.width
         assert config.terminal_height == config.terminal.height
 
+    def test_config_is_frozen(self) -> None:
+        """Test that neither the config nor its sections can be changed"""
+        config = ServerConfig()
+
+        with pytest.raises(ValidationError):
+            config.web = config.web.model_copy(update={"enabled": True})
+        with pytest.raises(ValidationError):
+            config.terminal.close_timeout = 1.0
+
+    def test_backward_compatibility_aliases_are_cached(self) -> None:
+        """Test that alias values are stored on the instance after first access"""
+        config = ServerConfig()
+        timeout = config.terminal_close_timeout
+
+        assert config.__dict__["terminal_close_timeout"] == timeout
+        # Cached aliases do not take part in model comparison or dumps
+        assert config == ServerConfig()
+        assert "terminal_close_timeout" not in config.model_dump()
+
+    def test_shared_config_is_loaded_once(self) -> None:
+        """Test that get_config returns one instance until reloaded"""
+        config = get_config()
+        assert get_config() is config
+
+        timeout = config.terminal_close_timeout
+        reloaded = reload_config()
+        assert reloaded is not config
+        assert get_config() is reloaded
+        assert reloaded == config
+        # A reload starts with an empty alias cache
+        assert "terminal_close_timeout" not in reloaded.__dict__
+        assert reloaded.terminal_close_timeout == timeout
+
     def test_terminal_emulators_property(self) -> None:
         """Test terminal emulators property conversion"""
         config = ServerConfig()
         emulators = config.terminal_emulators
 
-        # Should be a list of dicts for backward compatibility
-        assert isinstance(emulators, list)
+        # Should be a tuple of dicts, built once and reused
+        assert isinstance(emulators, tuple)
         assert len(emulators) > 0
         assert isinstance(emulators[0], dict)
         assert "name" in emulators[0]
         assert "command" in emulators[0]
-        assert isinstance(emulators[0]["command"], list)
+        assert isinstance(emulators[0]["command"], tuple)
+        assert config.terminal_emulators is emulators
 
     def test_real_toml_file_loading(self) -> None:
         """Test loading configuration values works correctly"""
@@ -223,3 +264,15 @@ class TestConfigurationIntegration:
         # Should work without environment variables
         assert config is not None
         assert config.web_enabled in (True, False)  # Should have a valid boolean value
+
+    def test_effective_web_port_is_stable(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that session URLs keep the startup port after a directory change"""
+        from src.terminal_control_mcp.main import _auto_web_port
+
+        _auto_web_port.cache_clear()
+        port = _auto_web_port()
+
+        monkeypatch.chdir(tmp_path)
+        assert _auto_web_port() == port
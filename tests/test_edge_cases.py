@@ -6,7 +6,6 @@ Tests unusual scenarios, error conditions, and boundary cases
 
 import asyncio
 import os
-import sys
 import time
 from pathlib import Path
 from typing import Any
@@ -14,9 +13,7 @@ from unittest.mock import MagicMock, patch
 
 import pytest
 
-# Add project root to path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
-
+from src.terminal_control_mcp.interactive_session import _send_keys
 from src.terminal_control_mcp.main import (
     exit_terminal,
     get_screen_content,
@@ -27,8 +24,8 @@ from src.terminal_control_mcp.models import OpenTerminalRequest
 from src.terminal_control_mcp.security import (
     CONTROL_CHAR_THRESHOLD,
     DEFAULT_MAX_CALLS_PER_MINUTE,
-    RateLimitData,
     SecurityManager,
+    TokenBucket,
 )
 
 
@@ -162,7 +159,7 @@ class TestRateLimitingEdgeCases:
         """Test edge cases around time windows"""
         client_id = "time_test"
 
-        with patch("time.time") as mock_time:
+        with patch("time.monotonic") as mock_time:
             # Test exactly at window boundary
             mock_time.return_value = 0
 
@@ -173,39 +170,40 @@ class TestRateLimitingEdgeCases:
             # Should be blocked
             assert security_manager._check_rate_limit(client_id) is False
 
-            # Move to exactly 60 seconds later
-            mock_time.return_value = 60.0
+            # Half a second later less than one token has been refilled
+            mock_time.return_value = 0.5
 
             # Should still be blocked (edge case)
             assert security_manager._check_rate_limit(client_id) is False
 
-            # Move to 60.1 seconds later
-            mock_time.return_value = 60.1
+            # One second later exactly one token is available again
+            mock_time.return_value = 1.0
 
-            # Should be allowed
+            # Should be allowed once, then blocked again
             assert security_manager._check_rate_limit(client_id) is True
+            assert security_manager._check_rate_limit(client_id) is False
 
-    def test_rate_limit_data_edge_cases(self) -> None:
-        """Test RateLimitData with edge cases"""
-        data = RateLimitData("test")
+    def test_token_bucket_edge_cases(self) -> None:
+        """Test TokenBucket with edge cases"""
+        bucket = TokenBucket(tokens=0.0, last_refill=time.monotonic())
 
-        # Test with no calls
-        data.clean_old_calls()
-        assert data.get_recent_call_count() == 0
+        # Test with an empty bucket
+        assert bucket.try_consume() is False
 
-        # Test with future timestamps (clock skew)
-        future_time = time.time() + 3600  # 1 hour in future
-        data.add_call(future_time)
-        data.clean_old_calls()
+        # Test with future timestamps (clock skew) - no tokens are lost
+        future_time = time.monotonic() + 3600  # 1 hour in future
+        bucket.refill(future_time, capacity=1.0, rate=1.0)
+        bucket.refill(time.monotonic(), capacity=1.0, rate=1.0)
 
-        # Future calls should still be counted
-        assert data.get_recent_call_count() == 1
+        # Refill is capped at capacity
+        assert bucket.try_consume() is True
+        assert bucket.try_consume() is False
 
     def test_rate_limit_with_extreme_values(self, security_manager: Any) -> None:
         """Test rate limiting with extreme values"""
         client_id = "extreme_test"
 
-        with patch("time.time") as mock_time:
+        with patch("time.monotonic") as mock_time:
             # Test with very large timestamps
             mock_time.return_value = 1e10
 
@@ -556,6 +554,15 @@ class TestErrorHandling:
             # Should be handled gracefully
             assert "Logging failed" not in str(e)
 
+    def test_rejected_send_keys_raises(self) -> None:
+        """Test that tmux errors from send-keys are not silently dropped"""
+        pane = MagicMock()
+        pane.cmd.return_value.stderr = ["unknown flag -a"]
+
+        with pytest.raises(RuntimeError, match="unknown flag"):
+            _send_keys(pane, "-la", enter=False, literal=True)
+        pane.cmd.assert_called_once_with("send-keys", "-l", "--", "-la")
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -27,6 +27,9 @@ from src.terminal_control_mcp.models import (
     SendInputRequest,
 )
 
+# Drives real tmux sessions with fixed waits; keep these out of parallel runs
+pytestmark = pytest.mark.integration
+
 
 class TestBasicCommands:
     """Test basic non-interactive command execution"""
@@ -118,6 +121,31 @@ class TestBasicCommands:
         destroy_request = DestroySessionRequest(session_id=result.session_id)
         await exit_terminal(destroy_request, mock_context)
 
+    @pytest.mark.asyncio
+    async def test_literal_input_starting_with_dash(self, mock_context: Any) -> None:
+        """Test that literal input starting with '-' is typed, not read as flags"""
+        request = OpenTerminalRequest(
+            shell="bash", working_directory=None, environment=None
+        )
+        result = await open_terminal(request, mock_context)
+        assert result.success
+        assert result.session_id
+
+        session_manager = mock_context.request_context.lifespan_context.session_manager
+        session = await session_manager.get_session(result.session_id)
+        try:
+            await asyncio.sleep(0.5)  # Allow time for shell startup
+            # Browser keystrokes are sent literally, one merged batch per call
+            await session.send_input("echo ", literal=True)
+            await session.send_input("-la_$((6*7))\r", literal=True)
+            await asyncio.sleep(0.5)
+
+            screen = await session.get_current_screen_content()
+            assert "-la_42" in screen.splitlines()
+        finally:
+            destroy_request = DestroySessionRequest(session_id=result.session_id)
+            await exit_terminal(destroy_request, mock_context)
+
 
 class TestSessionManagement:
     """Test session lifecycle management"""
@@ -5,16 +5,11 @@ Tests the complete workflow including security checks
 """
 
 import asyncio
-import os
-import sys
 from types import SimpleNamespace
 from unittest.mock import patch
 
 import pytest
 
-# Add project root to path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
-
 from src.terminal_control_mcp.main import (
     await_output,
     exit_terminal,
@@ -33,6 +28,9 @@ from src.terminal_control_mcp.models import (
 from src.terminal_control_mcp.security import SecurityManager
 from src.terminal_control_mcp.session_manager import SessionManager
 
+# Drives real tmux sessions with fixed waits; keep these out of parallel runs
+pytestmark = pytest.mark.integration
+
 # Test timing constants
 AWAIT_OUTPUT_MAX_TIME = 5.0
 AWAIT_OUTPUT_TIMEOUT_BUFFER = 1.5
@@ -393,7 +391,7 @@ class TestSecurityIntegrationScenarios:
 
         # Mock having too many sessions
         with patch.object(
-            session_manager, "sessions", {f"session_{i}": None for i in range(51)}
+            session_manager, "_entries", {f"session_{i}": None for i in range(51)}
         ):
             pass  # Test is about validating session limits directly
 
@@ -7,7 +7,7 @@ Focused on testing individual security validation methods without integration
 import json
 import os
 import tempfile
-import time
+from pathlib import Path
 from typing import Any
 from unittest.mock import patch
 
@@ -18,45 +18,53 @@ from src.terminal_control_mcp.security import (
     DEFAULT_MAX_SESSIONS,
     EXPECTED_MIN_BASE_PATHS,
     MAX_LOG_VALUE_LENGTH,
-    RateLimitData,
+    SecurityManager,
+    TokenBucket,
 )
 
 
-class TestRateLimitData:
-    """Test RateLimitData class functionality"""
+class TestTokenBucket:
+    """Test TokenBucket class functionality"""
 
-    def test_rate_limit_data_creation(self) -> None:
-        """Test creating RateLimitData instance"""
-        data = RateLimitData("test_client")
-        assert data.client_id == "test_client"
-        assert data.call_timestamps == []
-        assert data.get_recent_call_count() == 0
+    def test_token_bucket_creation(self) -> None:
+        """Test creating TokenBucket instance"""
+        capacity = float(DEFAULT_MAX_CALLS_PER_MINUTE)
+        bucket = TokenBucket(tokens=capacity, last_refill=0.0)
+        assert bucket.tokens == capacity
+        assert bucket.last_refill == 0.0
 
-    def test_add_call(self) -> None:
-        """Test adding calls to rate limit data"""
-        data = RateLimitData("test_client")
-        now = time.time()
+    def test_try_consume(self) -> None:
+        """Test consuming tokens until the bucket is empty"""
+        bucket = TokenBucket(tokens=2.0, last_refill=0.0)
 
-        data.add_call(now)
-        assert len(data.call_timestamps) == 1
-        assert data.get_recent_call_count() == 1
+        assert bucket.try_consume() is True
+        assert bucket.try_consume() is True
+        assert bucket.try_consume() is False
 
-    def test_clean_old_calls(self) -> None:
-        """Test cleaning old calls from rate limit data"""
-        data = RateLimitData("test_client")
-        now = time.time()
+    def test_refill(self) -> None:
+        """Test refilling tokens over time, capped at capacity"""
+        capacity = 60.0
+        elapsed = 30.0
+        bucket = TokenBucket(tokens=0.0, last_refill=0.0)
 
-        # Add old call (65 seconds ago)
-        data.add_call(now - 65)
-        # Add recent call (30 seconds ago)
-        data.add_call(now - 30)
+        # One token per second
+        bucket.refill(now=elapsed, capacity=capacity, rate=1.0)
+        assert bucket.tokens == elapsed
+        assert bucket.last_refill == elapsed
 
-        expected_call_count = 2
-        assert data.get_recent_call_count() == expected_call_count
+        # Never exceeds capacity
+        bucket.refill(now=elapsed * 100, capacity=capacity, rate=1.0)
+        assert bucket.tokens == capacity
 
-        # Clean calls older than 60 seconds
-        data.clean_old_calls(60)
-        assert data.get_recent_call_count() == 1
+    def test_refill_ignores_backwards_clock(self) -> None:
+        """Test that a clock moving backwards does not drain the bucket"""
+        tokens = 10.0
+        last_refill = 100.0
+        bucket = TokenBucket(tokens=tokens, last_refill=last_refill)
+
+        bucket.refill(now=last_refill - 50, capacity=60.0, rate=1.0)
+        assert bucket.tokens == tokens
+        assert bucket.last_refill == last_refill
 
 
 class TestSecurityManagerInit:
@@ -76,19 +84,25 @@ class TestCommandValidation:
     """Test command validation security features"""
 
     def test_validate_safe_commands(
-        self, security_manager: Any, safe_commands: list[str]
+        self, security_manager: Any, safe_commands: tuple[str, ...]
     ) -> None:
         """Test that safe commands are allowed"""
         for command in safe_commands:
             assert security_manager._validate_command(command) is True
 
     def test_block_dangerous_commands(
-        self, security_manager: Any, dangerous_commands: list[str]
+        self, security_manager: Any, dangerous_commands: tuple[str, ...]
     ) -> None:
         """Test that dangerous commands are blocked"""
         for command in dangerous_commands:
             assert security_manager._validate_command(command) is False
 
+    def test_block_dangerous_first_word(self, security_manager: Any) -> None:
+        """Test that disk tools are blocked only as the leading word"""
+        assert security_manager._validate_command("  FDISK -l") is False
+        assert security_manager._validate_command("wipefs") is False
+        assert security_manager._validate_command("echo fdisk") is True
+
     def test_empty_command_validation(self, security_manager: Any) -> None:
         """Test validation of empty or whitespace commands"""
         empty_commands = ["", "   ", "\t\n", None]
@@ -101,14 +115,14 @@ class TestInputValidation:
     """Test input validation and injection prevention"""
 
     def test_validate_safe_input(
-        self, security_manager: Any, safe_inputs: list[str]
+        self, security_manager: Any, safe_inputs: tuple[str, ...]
     ) -> None:
         """Test that safe input strings are allowed"""
         for input_str in safe_inputs:
             assert security_manager._validate_input(input_str) is True
 
     def test_block_injection_patterns(
-        self, security_manager: Any, malicious_inputs: list[str]
+        self, security_manager: Any, malicious_inputs: tuple[str, ...]
     ) -> None:
         """Test blocking shell injection patterns"""
         for input_str in malicious_inputs:
@@ -125,6 +139,14 @@ class TestInputValidation:
         for input_str in malicious_inputs:
             assert security_manager._validate_input(input_str) is False
 
+    def test_control_chars_blocked_in_long_input(self, security_manager: Any) -> None:
+        """Test that long inputs take the translate path with the same result"""
+        long_prefix = "a" * 500
+
+        assert security_manager._validate_input(long_prefix + "\t\n") is True
+        for bad_char in ("\x00", "\x01", "\x7f", "\x85", "\xff"):
+            assert security_manager._validate_input(long_prefix + bad_char) is False
+
     def test_allow_safe_control_chars(self, security_manager: Any) -> None:
         """Test allowing safe control characters (tab, newline, carriage return)"""
         safe_control_inputs = [
@@ -138,7 +160,7 @@ class TestInputValidation:
             assert security_manager._validate_input(input_str) is True
 
     def test_validate_interactive_input_text(
-        self, security_manager: Any, safe_inputs: list[str]
+        self, security_manager: Any, safe_inputs: tuple[str, ...]
     ) -> None:
         """Test safe interactive input text validation"""
         interactive_safe_inputs = [
@@ -152,11 +174,11 @@ class TestInputValidation:
         ]
 
         # Test both centralized safe inputs and interactive-specific ones
-        for input_str in safe_inputs + interactive_safe_inputs:
+        for input_str in (*safe_inputs, *interactive_safe_inputs):
             assert security_manager._validate_input_text(input_str) is True
 
     def test_block_dangerous_interactive_input(
-        self, security_manager: Any, malicious_inputs: list[str]
+        self, security_manager: Any, malicious_inputs: tuple[str, ...]
     ) -> None:
         """Test blocking dangerous interactive input"""
         interactive_dangerous_inputs = [
@@ -167,7 +189,7 @@ class TestInputValidation:
         ]
 
         # Test both centralized malicious inputs and interactive-specific ones
-        for input_str in malicious_inputs + interactive_dangerous_inputs:
+        for input_str in (*malicious_inputs, *interactive_dangerous_inputs):
             assert security_manager._validate_input_text(input_str) is False
 
 
@@ -182,19 +204,39 @@ class TestPathValidation:
             assert security_manager._validate_path(path) is True
 
     def test_block_path_traversal(
-        self, security_manager: Any, blocked_paths: list[str]
+        self, security_manager: Any, blocked_paths: tuple[str, ...]
     ) -> None:
         """Test blocking path traversal attempts"""
         for path in blocked_paths:
             assert security_manager._validate_path(path) is False
 
+    def test_dotted_file_names_are_not_traversal(self, security_manager: Any) -> None:
+        """Test that '..' inside a file name is not treated as traversal"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            assert security_manager._validate_path(f"{temp_dir}/foo..bar") is True
+            assert security_manager._validate_path(f"{temp_dir}/a/../b") is False
+
     def test_block_system_paths(
-        self, security_manager: Any, blocked_paths: list[str]
+        self, security_manager: Any, blocked_paths: tuple[str, ...]
     ) -> None:
         """Test blocking access to system paths"""
         for path in blocked_paths:
             assert security_manager._validate_path(path) is False
 
+    def test_reassigned_blocked_paths_take_effect(self, security_manager: Any) -> None:
+        """Test that assigning new blocked paths updates the compiled matchers"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            secret = os.path.join(temp_dir, "secret")
+            assert security_manager._validate_path(secret) is True
+
+            security_manager.blocked_paths = {secret}
+
+            assert security_manager._validate_path(secret) is False
+            assert security_manager._validate_command(f"cat {secret}") is False
+            assert security_manager._validate_command("cat /etc/shadow") is True
+            # Frozen, so the rules cannot be edited in place behind the matchers
+            assert isinstance(security_manager.blocked_paths, frozenset)
+
     def test_block_dangerous_extensions(self, security_manager: Any) -> None:
         """Test blocking files with dangerous extensions"""
         with tempfile.TemporaryDirectory() as temp_dir:
@@ -215,6 +257,58 @@ class TestPathValidation:
         assert security_manager._validate_path("") is False
         assert security_manager._validate_path(None) is False
 
+    def test_allowed_directory_prefix_boundary(self, security_manager: Any) -> None:
+        """Test that sibling directories sharing a name prefix are not allowed"""
+        security_manager.allowed_base_paths = {"/var/tmp"}
+
+        assert security_manager._validate_path("/var/tmp") is True
+        assert security_manager._validate_path("/var/tmp/upload.log") is True
+        assert security_manager._validate_path("/var/tmpfoo/upload.log") is False
+
+    def test_reassigned_allowed_base_paths_take_effect(
+        self, security_manager: Any
+    ) -> None:
+        """Test that assigning new allowed bases updates the resolved prefixes"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            target = os.path.join(temp_dir, "data.txt")
+            assert security_manager._validate_path(target) is True
+
+            security_manager.allowed_base_paths = {"/var/tmp"}
+
+            assert security_manager._validate_path(target) is False
+            assert isinstance(security_manager.allowed_base_paths, frozenset)
+
+    def test_symlinked_ancestor_is_resolved(self, security_manager: Any) -> None:
+        """Test that a symlinked directory cannot smuggle in a blocked path"""
+        with tempfile.TemporaryDirectory() as temp_dir:
+            link_dir = os.path.join(temp_dir, "etc_link")
+            os.symlink("/etc", link_dir)
+
+            assert security_manager._validate_path(f"{link_dir}/passwd") is False
+            assert security_manager._validate_path(f"{temp_dir}/plain.txt") is True
+
+    def test_path_is_revalidated_after_symlink_swap(
+        self, security_manager: Any, tmp_path: Path
+    ) -> None:
+        """Test that a directory swapped for a symlink is checked again"""
+        target = tmp_path / "data"
+        target.mkdir()
+        assert security_manager._validate_path(f"{target}/passwd") is True
+
+        target.rmdir()
+        target.symlink_to("/etc")
+        assert security_manager._validate_path(f"{target}/passwd") is False
+
+    def test_relative_path_follows_working_directory(
+        self, security_manager: Any, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        """Test that relative paths are resolved against the current directory"""
+        monkeypatch.chdir(tmp_path)
+        assert security_manager._validate_path("passwd") is True
+
+        monkeypatch.chdir("/etc")
+        assert security_manager._validate_path("passwd") is False
+
 
 class TestEnvironmentValidation:
     """Test environment variable validation"""
@@ -244,7 +338,7 @@ class TestEnvironmentValidation:
         assert security_manager._validate_environment(invalid_env_vals) is False
 
     def test_validate_environment_with_injection(
-        self, security_manager: Any, malicious_inputs: list[str]
+        self, security_manager: Any, malicious_inputs: tuple[str, ...]
     ) -> None:
         """Test blocking environment variables with injection patterns"""
         malicious_env = {
@@ -298,7 +392,7 @@ class TestRateLimiting:
         client_id = "test_client"
 
         # Mock time to test time window
-        with patch("time.time") as mock_time:
+        with patch("time.monotonic") as mock_time:
             # Start at time 0
             mock_time.return_value = 0
 
@@ -440,10 +534,10 @@ class TestAuditLogging:
         # Non-strings should be converted and truncated
         assert sanitized["non_string"] == "12345"
 
-    def test_write_audit_log(
-        self, security_manager: Any, mock_audit_log_path: str
-    ) -> None:
+    def test_write_audit_log(self, mock_audit_log_path: str) -> None:
         """Test writing audit logs to file"""
+        # The audit path is read at construction time
+        security_manager = SecurityManager()
         log_entry = {
             "timestamp": "2023-01-01T00:00:00",
             "event_type": "test_event",
@@ -460,12 +554,44 @@ class TestAuditLogging:
         with open(mock_audit_log_path) as f:
             written_content = f.read().strip()
             assert json.loads(written_content) == log_entry
+        security_manager.close()
+
+    def test_audit_log_handle_is_reused(self, mock_audit_log_path: str) -> None:
+        """Test that the audit log is opened once and appended per event"""
+        security_manager = SecurityManager()
+        audit_fp = security_manager._audit_fp
+        entry_count = 3
+
+        for index in range(entry_count):
+            security_manager._write_audit_log({"event_type": f"event_{index}"})
+
+        assert security_manager._audit_fp is audit_fp
+        with open(mock_audit_log_path) as f:
+            lines = f.read().splitlines()
+        assert len(lines) == entry_count
+        assert json.loads(lines[-1]) == {"event_type": f"event_{entry_count - 1}"}
+
+        security_manager.close()
+        assert audit_fp.closed
+        security_manager.close()  # A second close is a no-op
+
+    def test_write_audit_log_without_fcntl(self, mock_audit_log_path: str) -> None:
+        """Test that audit logging still works where fcntl is unavailable"""
+        security_manager = SecurityManager()
+
+        with patch("src.terminal_control_mcp.security.fcntl", None):
+            security_manager._write_audit_log({"event_type": "unlocked"})
+
+        with open(mock_audit_log_path) as f:
+            assert json.loads(f.read()) == {"event_type": "unlocked"}
+        security_manager.close()
 
     def test_log_security_event(self, security_manager: Any) -> None:
         """Test logging security events"""
         with patch.object(security_manager, "_write_audit_log") as mock_write:
-            with patch("logging.getLogger") as mock_logger:
-                mock_security_logger = mock_logger.return_value
+            with patch.object(
+                security_manager, "_security_logger"
+            ) as mock_security_logger:
 
                 arguments = {"test": "data"}
                 security_manager._log_security_event(
@@ -485,6 +611,45 @@ class TestAuditLogging:
                 assert log_entry["client_id"] == "test_client"
                 assert "timestamp" in log_entry
 
+    def test_allowed_call_skips_audit_when_disabled(
+        self, security_manager: Any
+    ) -> None:
+        """Test that allowed calls build no audit entry when nothing listens"""
+        with patch.object(security_manager, "_log_security_event") as mock_log:
+            with patch.object(
+                security_manager._security_logger, "isEnabledFor", return_value=False
+            ):
+                assert (
+                    security_manager.validate_tool_call("list_terminal_sessions", {})
+                    is True
+                )
+            mock_log.assert_not_called()
+
+    def test_security_event_serialized_once(self, mock_audit_log_path: str) -> None:
+        """Test that one JSON dump is shared by the logger and the audit file"""
+        security_manager = SecurityManager()
+        with (
+            patch.object(
+                security_manager._security_logger, "isEnabledFor", return_value=True
+            ),
+            patch(
+                "src.terminal_control_mcp.security.json.dumps", wraps=json.dumps
+            ) as mock_dumps,
+            patch.object(security_manager._security_logger, "info") as mock_info,
+        ):
+            security_manager._log_security_event(
+                "test_event", "test_tool", {"test": "data"}, "test_client"
+            )
+            # The logger receives the lazy entry and renders it on demand
+            assert json.loads(str(mock_info.call_args[0][1]))["tool_name"] == (
+                "test_tool"
+            )
+
+        mock_dumps.assert_called_once()
+        with open(mock_audit_log_path) as f:
+            assert json.loads(f.read())["event_type"] == "test_event"
+        security_manager.close()
+
 
 class TestSecurityIntegration:
     """Integration tests for security features"""
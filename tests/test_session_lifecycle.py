@@ -6,7 +6,7 @@ Tests automatic cleanup when shells exit and terminal window closing when MCP to
 
 import asyncio
 import os
-import sys
+import time
 from collections.abc import AsyncGenerator, Generator
 from types import SimpleNamespace
 from typing import Any, cast
@@ -16,9 +16,7 @@ import pytest
 import pytest_asyncio
 from mcp.server.fastmcp import Context
 
-# Add project root to path
-sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
-
+from src.terminal_control_mcp import terminal_utils
 from src.terminal_control_mcp.main import (
     exit_terminal,
     get_screen_content,
@@ -33,7 +31,29 @@ from src.terminal_control_mcp.models import (
     SendInputRequest,
 )
 from src.terminal_control_mcp.security import SecurityManager
-from src.terminal_control_mcp.session_manager import SessionManager, SessionState
+from src.terminal_control_mcp.session_manager import (
+    SessionEntry,
+    SessionManager,
+    SessionState,
+)
+
+
+def _register_session(
+    session_manager: SessionManager,
+    session_id: str,
+    session: Any,
+    metadata: Any | None = None,
+) -> Any:
+    """Store a mock session directly in the manager, returning its metadata"""
+    metadata = metadata if metadata is not None else MagicMock()
+    session_manager._entries[session_id] = SessionEntry(session, metadata)
+    session_manager._invalidate_snapshot()
+    return metadata
+
+
+def _mark_window_open(session_id: str) -> None:
+    """Record a tmux session as opened so closing it issues kill-session"""
+    terminal_utils._open_tmux_sessions.add(f"mcp_{session_id}")
 
 
 class MockContext:
@@ -101,19 +121,77 @@ class TestBidirectionalSessionDestruction:
         session_id = "test_session_dead"
 
         # Add session to manager manually
-        session_manager.sessions[session_id] = mock_session
-        session_manager.session_metadata[session_id] = MagicMock()
-        session_manager.session_metadata[session_id].session_id = session_id
-        session_manager.session_metadata[session_id].state = SessionState.ACTIVE
+        metadata = _register_session(session_manager, session_id, mock_session)
+        metadata.session_id = session_id
+        metadata.state = SessionState.ACTIVE
 
         # Run one cycle of the cleanup function directly
-        dead_sessions = session_manager._find_dead_sessions()
+        dead_sessions = await session_manager._find_dead_sessions()
         for session_id in dead_sessions:
             await session_manager.destroy_session(session_id)
 
         # Session should be automatically destroyed
-        assert session_id not in session_manager.sessions
-        assert session_id not in session_manager.session_metadata
+        assert session_id not in session_manager._entries
+
+    def test_generated_session_ids_are_unique(
+        self, session_manager: SessionManager
+    ) -> None:
+        """Test that generated session ids never repeat within a manager"""
+        id_count = 1000
+        session_ids = {
+            session_manager._generate_session_id("bash") for _ in range(id_count)
+        }
+        assert len(session_ids) == id_count
+
+    @pytest.mark.asyncio
+    async def test_concurrent_creation_respects_session_limit(
+        self, session_manager: SessionManager
+    ) -> None:
+        """Test that racing create_session calls cannot exceed max_sessions"""
+        session_limit = 1
+        attempts = 3
+        session_manager.max_sessions = session_limit
+
+        async def _yielding_initialize(*_args: Any) -> None:
+            await asyncio.sleep(0)
+
+        mock_session = MagicMock()
+        mock_session.terminate = AsyncMock()
+        with (
+            patch.object(
+                session_manager, "_create_session_object", return_value=mock_session
+            ),
+            patch.object(
+                session_manager,
+                "_initialize_session",
+                side_effect=_yielding_initialize,
+            ),
+        ):
+            results = await asyncio.gather(
+                *(session_manager.create_session("bash") for _ in range(attempts)),
+                return_exceptions=True,
+            )
+
+        rejected = [r for r in results if isinstance(r, RuntimeError)]
+        assert len(rejected) == attempts - session_limit
+        assert len(session_manager._entries) == session_limit
+
+    @pytest.mark.asyncio
+    async def test_get_session_throttles_last_activity(
+        self, session_manager: SessionManager
+    ) -> None:
+        """Test that last_activity is refreshed only once it is stale"""
+        stale_age = 5.0
+        metadata = _register_session(session_manager, "activity_session", MagicMock())
+        metadata.last_activity = time.time()
+        fresh_timestamp = metadata.last_activity
+
+        await session_manager.get_session("activity_session")
+        assert metadata.last_activity == fresh_timestamp
+
+        metadata.last_activity = fresh_timestamp - stale_age
+        await session_manager.get_session("activity_session")
+        assert metadata.last_activity >= fresh_timestamp
 
     @pytest.mark.asyncio
     async def test_background_cleanup_task_initialization(
@@ -145,8 +223,7 @@ class TestBidirectionalSessionDestruction:
         mock_session = AsyncMock()
         mock_session.terminate = AsyncMock()
         session_id = "test_session_shutdown"
-        session_manager.sessions[session_id] = mock_session
-        session_manager.session_metadata[session_id] = MagicMock()
+        _register_session(session_manager, session_id, mock_session)
 
         # Start cleanup task so we can test shutdown
         session_manager._ensure_cleanup_task_running()
@@ -159,8 +236,116 @@ class TestBidirectionalSessionDestruction:
         assert session_manager._shutdown_event.is_set()
         if session_manager._cleanup_task is not None:
             assert session_manager._cleanup_task.done()
-        assert len(session_manager.sessions) == 0
-        assert len(session_manager.session_metadata) == 0
+        assert len(session_manager._entries) == 0
+
+    @pytest.mark.asyncio
+    async def test_shutdown_destroys_sessions_concurrently(
+        self, session_manager: SessionManager
+    ) -> None:
+        """Test that shutdown tears down all sessions in one concurrent pass"""
+        session_count = 3
+        started = asyncio.Event()
+        in_flight = 0
+        max_in_flight = 0
+
+        async def slow_terminate() -> None:
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            if in_flight == session_count:
+                started.set()
+            await asyncio.wait_for(started.wait(), timeout=1.0)
+            in_flight -= 1
+
+        for i in range(session_count):
+            mock_session = MagicMock()
+            mock_session.terminate = slow_terminate
+            _register_session(session_manager, f"shutdown_session_{i}", mock_session)
+
+        with patch.object(
+            session_manager, "_close_terminal_window_if_needed", new_callable=AsyncMock
+        ):
+            await session_manager.shutdown()
+
+        assert max_in_flight == session_count
+        assert len(session_manager._entries) == 0
+
+    @pytest.mark.asyncio
+    async def test_concurrent_destroy_tears_down_once(
+        self, session_manager: SessionManager
+    ) -> None:
+        """Test that racing destroys of one session terminate it exactly once"""
+        mock_session = MagicMock()
+        mock_session.terminate = AsyncMock()
+        _register_session(session_manager, "raced_session", mock_session)
+
+        with patch.object(
+            session_manager, "_close_terminal_window_if_needed", new_callable=AsyncMock
+        ):
+            results = await asyncio.gather(
+                session_manager.destroy_session("raced_session"),
+                session_manager.destroy_session("raced_session"),
+            )
+
+        assert sorted(results) == [False, True]
+        mock_session.terminate.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_destroy_all_survives_failing_session(
+        self, session_manager: SessionManager
+    ) -> None:
+        """Test that destroy_all removes every session even if one teardown fails"""
+        healthy_count = 2
+
+        for i in range(healthy_count):
+            mock_session = MagicMock()
+            mock_session.terminate = AsyncMock()
+            _register_session(session_manager, f"healthy_session_{i}", mock_session)
+        _register_session(session_manager, "failing_session", MagicMock())
+
+        with (
+            patch.object(
+                session_manager,
+                "_close_terminal_window_if_needed",
+                new_callable=AsyncMock,
+            ),
+            patch.object(
+                session_manager,
+                "_terminate_session_process",
+                new_callable=AsyncMock,
+                side_effect=[None, None, RuntimeError("teardown failed")],
+            ),
+        ):
+            destroyed = await session_manager.destroy_all()
+
+        assert destroyed == healthy_count
+        assert len(session_manager._entries) == 0
+
+    @pytest.mark.asyncio
+    async def test_list_sessions_reuses_snapshot_until_mutation(
+        self, session_manager: SessionManager
+    ) -> None:
+        """Test that repeated listings share one snapshot until a session is removed"""
+        metadata = _register_session(session_manager, "listed_session", MagicMock())
+
+        first = await session_manager.list_sessions()
+        assert first == (metadata,)
+        assert await session_manager.list_sessions() is first
+
+        session_manager._cleanup_session_from_manager("listed_session")
+        assert await session_manager.list_sessions() == ()
+
+    @pytest.mark.asyncio
+    async def test_get_session_metadata_by_id(
+        self, session_manager: SessionManager
+    ) -> None:
+        """Test that metadata is looked up by id without touching last_activity"""
+        metadata = _register_session(session_manager, "meta_session", MagicMock())
+        metadata.last_activity = 0.0
+
+        assert await session_manager.get_session_metadata("meta_session") is metadata
+        assert metadata.last_activity == 0.0
+        assert await session_manager.get_session_metadata("missing_session") is None
 
     @pytest.mark.asyncio
     async def test_destroy_session_with_terminal_window_closing(
@@ -172,8 +357,8 @@ class TestBidirectionalSessionDestruction:
         mock_session = AsyncMock()
         mock_session.terminate = AsyncMock()
         session_id = "test_session_destroy"
-        session_manager.sessions[session_id] = mock_session
-        session_manager.session_metadata[session_id] = MagicMock()
+        _register_session(session_manager, session_id, mock_session)
+        _mark_window_open(session_id)
 
         # Mock subprocess for tmux kill-session
         with patch("asyncio.create_subprocess_exec") as mock_subprocess:
@@ -191,7 +376,7 @@ class TestBidirectionalSessionDestruction:
             )
 
             assert result is True
-            assert session_id not in session_manager.sessions
+            assert session_id not in session_manager._entries
 
             # Verify tmux kill-session was called
             mock_subprocess.assert_called_once()
@@ -219,8 +404,7 @@ class TestBidirectionalSessionDestruction:
             mock_session = AsyncMock()
             mock_session.terminate = AsyncMock()
             session_id = "test_session_web_enabled"
-            session_manager.sessions[session_id] = mock_session
-            session_manager.session_metadata[session_id] = MagicMock()
+            _register_session(session_manager, session_id, mock_session)
 
             # Call destroy_session with terminal closing enabled (should be prevented by mock)
             result = await session_manager.destroy_session(
@@ -228,7 +412,26 @@ class TestBidirectionalSessionDestruction:
             )
 
             assert result is True
-            assert session_id not in session_manager.sessions
+            assert session_id not in session_manager._entries
+
+    @pytest.mark.asyncio
+    async def test_destroy_session_uses_web_enabled_from_init(self) -> None:
+        """Test that the web_enabled flag given at init skips window closing"""
+        manager = SessionManager(web_enabled=True)
+        mock_session = AsyncMock()
+        session_id = "test_session_web_flag"
+        _register_session(manager, session_id, mock_session)
+
+        with patch(
+            "src.terminal_control_mcp.terminal_utils.close_terminal_window"
+        ) as mock_close:
+            result = await manager.destroy_session(
+                session_id, close_terminal_window=True
+            )
+
+        assert result is True
+        mock_close.assert_not_called()
+        await manager.shutdown()
 
     @pytest.mark.asyncio
     async def test_exit_terminal_tool_triggers_session_destruction(
@@ -239,8 +442,7 @@ class TestBidirectionalSessionDestruction:
         # Mock a session
         mock_session = AsyncMock()
         session_id = "test_exit_terminal"
-        session_manager.sessions[session_id] = mock_session
-        session_manager.session_metadata[session_id] = MagicMock()
+        _register_session(session_manager, session_id, mock_session)
 
         # Mock the destroy_session method to verify it's called
         with patch.object(
@@ -266,8 +468,8 @@ class TestBidirectionalSessionDestruction:
         mock_session = AsyncMock()
         mock_session.terminate = AsyncMock()
         session_id = "test_session_error"
-        session_manager.sessions[session_id] = mock_session
-        session_manager.session_metadata[session_id] = MagicMock()
+        _register_session(session_manager, session_id, mock_session)
+        _mark_window_open(session_id)
 
         # Mock subprocess to simulate failure
         with patch("asyncio.create_subprocess_exec") as mock_subprocess:
@@ -285,7 +487,7 @@ class TestBidirectionalSessionDestruction:
             )
 
             assert result is True
-            assert session_id not in session_manager.sessions
+            assert session_id not in session_manager._entries
 
     @pytest.mark.asyncio
     async def test_terminal_window_closing_timeout_handling(
@@ -297,8 +499,8 @@ class TestBidirectionalSessionDestruction:
         mock_session = AsyncMock()
         mock_session.terminate = AsyncMock()
         session_id = "test_session_timeout"
-        session_manager.sessions[session_id] = mock_session
-        session_manager.session_metadata[session_id] = MagicMock()
+        _register_session(session_manager, session_id, mock_session)
+        _mark_window_open(session_id)
 
         # Mock subprocess to simulate timeout
         with (
@@ -314,7 +516,7 @@ class TestBidirectionalSessionDestruction:
             )
 
             assert result is True
-            assert session_id not in session_manager.sessions
+            assert session_id not in session_manager._entries
 
     @pytest.mark.asyncio
     async def test_cleanup_task_handles_session_check_errors(
@@ -335,10 +537,9 @@ class TestBidirectionalSessionDestruction:
         session_id = "test_session_error"
 
         # Add session to manager manually
-        session_manager.sessions[session_id] = mock_session
         mock_metadata = MagicMock()
         mock_metadata.session_id = session_id
-        session_manager.session_metadata[session_id] = mock_metadata
+        _register_session(session_manager, session_id, mock_session, mock_metadata)
 
         # Mock the _close_terminal_window_if_needed method to avoid subprocess calls
         async def mock_close_if_needed(
@@ -352,13 +553,12 @@ class TestBidirectionalSessionDestruction:
             side_effect=mock_close_if_needed,
         ):
             # Run cleanup task manually - should handle error gracefully
-            dead_sessions = session_manager._find_dead_sessions()
+            dead_sessions = await session_manager._find_dead_sessions()
             for session_id in dead_sessions:
                 await session_manager.destroy_session(session_id)
 
             # Session should be destroyed due to error
-            assert session_id not in session_manager.sessions
-            assert session_id not in session_manager.session_metadata
+            assert session_id not in session_manager._entries
 
     @pytest.mark.asyncio
     async def test_multiple_sessions_cleanup(
@@ -390,30 +590,57 @@ class TestBidirectionalSessionDestruction:
 
                 mock_session.terminate = mock_terminate
 
-                session_manager.sessions[session_id] = mock_session
-                session_manager.session_metadata[session_id] = MagicMock()
-                session_manager.session_metadata[session_id].session_id = session_id
+                metadata = _register_session(session_manager, session_id, mock_session)
+                metadata.session_id = session_id
                 dead_sessions.append(session_id)
 
             # Add one alive session
             alive_session_id = "alive_session"
             alive_session = MagicMock()
             alive_session.is_process_alive.return_value = True
-            session_manager.sessions[alive_session_id] = alive_session
-            session_manager.session_metadata[alive_session_id] = MagicMock()
+            _register_session(session_manager, alive_session_id, alive_session)
 
             # Run cleanup
-            dead_sessions = session_manager._find_dead_sessions()
+            dead_sessions = await session_manager._find_dead_sessions()
             for session_id in dead_sessions:
                 await session_manager.destroy_session(session_id)
 
             # Dead sessions should be removed, alive session should remain
             for session_id in dead_sessions:
-                assert session_id not in session_manager.sessions
-                assert session_id not in session_manager.session_metadata
+                assert session_id not in session_manager._entries
 
-            assert alive_session_id in session_manager.sessions
-            assert alive_session_id in session_manager.session_metadata
+            assert alive_session_id in session_manager._entries
+
+    @pytest.mark.asyncio
+    async def test_dead_session_cleanup_in_batches(
+        self, session_manager: SessionManager
+    ) -> None:
+        """Test that dead sessions are probed and destroyed across batches"""
+        session_count = 5
+        batch_size = 2
+
+        for i in range(session_count):
+            mock_session = MagicMock()
+            mock_session.is_process_alive.return_value = False
+            mock_session.terminate = AsyncMock()
+            _register_session(session_manager, f"batched_session_{i}", mock_session)
+
+        with (
+            patch(
+                "src.terminal_control_mcp.session_manager.CLEANUP_BATCH_SIZE",
+                batch_size,
+            ),
+            patch.object(
+                session_manager,
+                "_close_terminal_window_if_needed",
+                new_callable=AsyncMock,
+            ),
+        ):
+            dead_sessions = await session_manager._find_dead_sessions()
+            await session_manager._destroy_dead_sessions(dead_sessions)
+
+        assert len(dead_sessions) == session_count
+        assert len(session_manager._entries) == 0
 
     @pytest.mark.asyncio
     async def test_session_state_updates_on_death_detection(
@@ -427,22 +654,22 @@ class TestBidirectionalSessionDestruction:
         mock_session.terminate = AsyncMock()
         session_id = "test_session_state"
 
-        session_manager.sessions[session_id] = mock_session
         mock_metadata = MagicMock()
         mock_metadata.session_id = session_id
         mock_metadata.state = SessionState.ACTIVE
-        session_manager.session_metadata[session_id] = mock_metadata
+        _register_session(session_manager, session_id, mock_session, mock_metadata)
 
         # Run cleanup
-        dead_sessions = session_manager._find_dead_sessions()
+        dead_sessions = await session_manager._find_dead_sessions()
         for session_id in dead_sessions:
             await session_manager.destroy_session(session_id)
 
         # Session should be destroyed, but we can verify the state was updated before destruction
         # (In real implementation, the state is updated before destroy_session is called)
-        assert session_id not in session_manager.sessions
+        assert session_id not in session_manager._entries
 
 
+@pytest.mark.integration
 class TestSessionLifecycleIntegration:
     """Integration tests for complete session lifecycle with real MCP tools"""
 
@@ -570,7 +797,13 @@ class TestTerminalWindowManagement:
     @pytest.mark.asyncio
     async def test_terminal_emulator_detection(self) -> None:
         """Test terminal emulator detection function"""
-        from src.terminal_control_mcp.terminal_utils import detect_terminal_emulator
+        from src.terminal_control_mcp.terminal_utils import (
+            _reset_detection,
+            detect_terminal_emulator,
+        )
+
+        # Detection is cached, so start from a clean slate for each scenario
+        _reset_detection()
 
         # Test when gnome-terminal is available
         with patch(
@@ -582,6 +815,13 @@ class TestTerminalWindowManagement:
             result = detect_terminal_emulator()
             assert result == "gnome-terminal"
 
+            # A repeated call is served from the cache without another PATH scan
+            lookups_after_detection = mock_which.call_count
+            assert detect_terminal_emulator() == "gnome-terminal"
+            assert mock_which.call_count == lookups_after_detection
+
+        _reset_detection()
+
         # Test when no terminal is available (separate patch context)
         with patch(
             "src.terminal_control_mcp.terminal_utils.shutil.which"
@@ -590,6 +830,87 @@ class TestTerminalWindowManagement:
             result = detect_terminal_emulator()
             assert result is None
 
+        _reset_detection()
+
+    def test_build_terminal_command_templates(self) -> None:
+        """Test the attach argv built for special, generic and unknown emulators"""
+        from src.terminal_control_mcp.terminal_utils import _build_terminal_command
+
+        name = "mcp_test"
+        assert _build_terminal_command("open", name) == [
+            "open",
+            "-a",
+            "Terminal",
+            "--args",
+            "tmux",
+            "attach-session",
+            "-t",
+            name,
+        ]
+        assert _build_terminal_command("kitty", name) == [
+            "kitty",
+            "tmux",
+            "attach-session",
+            "-t",
+            name,
+        ]
+        assert _build_terminal_command("gnome-terminal", name) == [
+            "gnome-terminal",
+            "--",
+            "tmux",
+            "attach-session",
+            "-t",
+            name,
+        ]
+        assert _build_terminal_command("unknown-term", name) == [
+            "unknown-term",
+            "-e",
+            "tmux",
+            "attach-session",
+            "-t",
+            name,
+        ]
+
+    def test_spawn_options_use_absolute_executable(self) -> None:
+        """Test that spawns pass a resolved executable so posix_spawn can be used"""
+        from src.terminal_control_mcp.terminal_utils import (
+            _reset_detection,
+            _spawn_options,
+        )
+
+        _reset_detection()
+        with patch(
+            "src.terminal_control_mcp.terminal_utils.shutil.which",
+            side_effect=lambda cmd: "/usr/bin/tmux" if cmd == "tmux" else None,
+        ):
+            assert _spawn_options("tmux") == {
+                "executable": "/usr/bin/tmux",
+                "close_fds": False,
+            }
+            assert _spawn_options("missing-terminal") == {}
+        _reset_detection()
+
+    def test_terminal_environment_is_cached(self) -> None:
+        """Test that the terminal environment is built once until invalidated"""
+        from src.terminal_control_mcp.terminal_utils import (
+            _prepare_environment,
+            invalidate_env_cache,
+        )
+
+        invalidate_env_cache()
+        with patch.dict(os.environ, {"GTK_PATH": "/snap/gtk"}):
+            env = _prepare_environment()
+            assert _prepare_environment() is env
+            assert "GTK_PATH" not in env
+            assert "DISPLAY" in env
+
+        with patch.dict(os.environ, {"MCP_TEST_MARKER": "1"}):
+            assert "MCP_TEST_MARKER" not in _prepare_environment()
+            invalidate_env_cache()
+            assert _prepare_environment()["MCP_TEST_MARKER"] == "1"
+
+        invalidate_env_cache()
+
     @pytest.mark.asyncio
     async def test_terminal_window_opening_success(self) -> None:
         """Test successful terminal window opening"""
@@ -678,6 +999,7 @@ class TestTerminalWindowManagement:
         from src.terminal_control_mcp.terminal_utils import close_terminal_window
 
         session_id = "test_session"
+        _mark_window_open(session_id)
 
         # Mock subprocess for tmux kill-session
         with patch("asyncio.create_subprocess_exec") as mock_subprocess:
@@ -696,6 +1018,9 @@ class TestTerminalWindowManagement:
             mock_subprocess.assert_called_once()
             args = mock_subprocess.call_args[0]
             assert args == ("tmux", "kill-session", "-t", f"mcp_{session_id}")
+            # The success path does not open a stderr pipe
+            stderr_target = mock_subprocess.call_args.kwargs["stderr"]
+            assert stderr_target == asyncio.subprocess.DEVNULL
 
     @pytest.mark.asyncio
     async def test_terminal_window_closing_failure(self) -> None:
@@ -703,6 +1028,7 @@ class TestTerminalWindowManagement:
         from src.terminal_control_mcp.terminal_utils import close_terminal_window
 
         session_id = "test_session"
+        _mark_window_open(session_id)
 
         # Mock subprocess failure
         with patch("asyncio.create_subprocess_exec") as mock_subprocess:
@@ -717,6 +1043,43 @@ class TestTerminalWindowManagement:
             result = await close_terminal_window(session_id)
             assert result is False
 
+    @pytest.mark.asyncio
+    async def test_terminal_window_closing_skips_unopened_session(self) -> None:
+        """Test closing a window that was never opened spawns no tmux process"""
+        from src.terminal_control_mcp.terminal_utils import close_terminal_window
+
+        session_id = "test_session_never_opened"
+
+        with patch("asyncio.create_subprocess_exec") as mock_subprocess:
+            result = await close_terminal_window(session_id)
+            assert result is True
+            mock_subprocess.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_terminal_window_opening_records_session(self) -> None:
+        """Test a successful open registers the tmux session for closing"""
+        from src.terminal_control_mcp.terminal_utils import open_terminal_window
+
+        session_id = "test_session_recorded"
+        tmux_session_name = f"mcp_{session_id}"
+
+        with (
+            patch(
+                "src.terminal_control_mcp.terminal_utils.detect_terminal_emulator",
+                return_value="gnome-terminal",
+            ),
+            patch("asyncio.create_subprocess_exec") as mock_subprocess,
+            patch("asyncio.wait_for", return_value=None),
+        ):
+            mock_process = AsyncMock()
+            mock_process.returncode = 0
+            mock_subprocess.return_value = mock_process
+
+            assert await open_terminal_window(session_id) is True
+
+        assert tmux_session_name in terminal_utils._open_tmux_sessions
+        terminal_utils._open_tmux_sessions.discard(tmux_session_name)
+
 
 if __name__ == "__main__":
     # Allow running tests directly
@@ -0,0 +1,59 @@
+"""Tests for the web server's overview broadcasts"""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.terminal_control_mcp import web_server
+from src.terminal_control_mcp.web_server import WebServer
+
+# Short enough that a stalled send times out quickly in tests
+TEST_SEND_TIMEOUT = 0.05
+
+
+@pytest.fixture
+def server() -> WebServer:
+    """Create a WebServer backed by a session manager with no sessions"""
+    session_manager = MagicMock()
+    session_manager.list_sessions = AsyncMock(return_value=())
+    return WebServer(session_manager)
+
+
+def _overview_client(stalled: bool = False) -> MagicMock:
+    """Create a mock overview websocket, optionally one that never accepts data"""
+
+    async def stall(_message: str) -> None:
+        await asyncio.Event().wait()
+
+    client = MagicMock()
+    client.send_text = AsyncMock(side_effect=stall if stalled else None)
+    client.close = AsyncMock()
+    return client
+
+
+class TestOverviewBroadcast:
+    """Test broadcasting session updates to overview clients"""
+
+    @pytest.mark.asyncio
+    async def test_stalled_client_is_closed_and_gets_nothing_more(
+        self, server: WebServer
+    ) -> None:
+        """Test that a client that stalls a broadcast is closed and dropped"""
+        healthy = _overview_client()
+        stalled = _overview_client(stalled=True)
+        server.overview_websockets.extend([healthy, stalled])
+
+        with patch.object(web_server, "OVERVIEW_SEND_TIMEOUT", TEST_SEND_TIMEOUT):
+            await server._broadcast_session_update()
+
+        assert server.overview_websockets == [healthy]
+        stalled.close.assert_awaited_once()
+        healthy.close.assert_not_called()
+
+        # The stalled client's own refresh loop stops instead of sending again
+        with patch.object(web_server.asyncio, "sleep", AsyncMock()):
+            await asyncio.wait_for(
+                server._handle_overview_websocket_loop(stalled), timeout=1.0
+            )
+        assert stalled.send_text.await_count == 1